@@ -0,0 +1,153 @@
+"""
+MIT License
+
+Copyright (c) 2025 Omkaar
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+# pylint: skip-file
+import os
+import tempfile
+import time
+import unittest
+from multiprocessing import get_context
+from unittest import mock
+
+import xkcd
+from xkcd import crawl
+
+flaky = set()
+
+def download_comic_data(number):
+    if number == 404:
+        return None
+    if number in flaky:
+        flaky.discard(number)
+        raise ConnectionError("blip")
+    return {
+        "num": number, "year": "2006", "month": "1", "day": "1", "safe_title": f"Comic {number}",
+        "title": f"Comic {number}", "transcript": "", "img": "https://imgs.xkcd.com/comics/a.png", "alt": ""
+    }
+
+def run_worker(path, name):
+    with mock.patch.dict(crawl._FETCHERS, {"comics": download_comic_data}):
+        return xkcd.Crawl(path).work(worker=name, max_workers=2)
+
+class TestCrawl(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "crawl.db")
+        self.crawl = xkcd.Crawl(self.path, lease_seconds=60)
+        patch = mock.patch.dict(crawl._FETCHERS, {"comics": download_comic_data})
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def test_plan(self):
+        self.assertEqual(self.crawl.plan("comics", 1, 120, unit_size=50), 3)
+        self.assertEqual(self.crawl.plan("comics", 1, 120, unit_size=50), 0)
+        self.assertEqual(self.crawl.progress(), {"pending": 3, "leased": 0, "done": 0, "failed": 0})
+        with self.assertRaises(ValueError):
+            self.crawl.plan("comics", 5, 1)
+
+    def test_claim_is_exclusive(self):
+        self.crawl.plan("comics", 1, 20, unit_size=10)
+        first = self.crawl.claim("a")
+        second = self.crawl.claim("b")
+        self.assertNotEqual(first.start, second.start)
+        self.assertIsNone(self.crawl.claim("c"))
+
+    def test_expired_lease(self):
+        self.crawl.plan("comics", 1, 10, unit_size=10)
+        short = xkcd.Crawl(self.path, lease_seconds=0.05)
+        lost = short.claim("crashed")
+        time.sleep(0.1)
+        unit = self.crawl.claim("b")
+        self.assertEqual((unit.start, unit.attempts), (1, 2))
+        self.assertFalse(short.commit(lost, {1: {"num": 1}}))
+        self.assertTrue(self.crawl.commit(unit, {number: download_comic_data(number) for number in unit}))
+        self.assertEqual(self.crawl.progress()["done"], 1)
+
+    def test_work(self):
+        self.crawl.plan("comics", 1, 25, unit_size=10)
+        self.assertEqual(self.crawl.work(max_workers=4), 3)
+        self.assertEqual([comic.number for comic in self.crawl.comics()], list(range(1, 26)))
+
+    def test_missing_numbers_are_not_retried(self):
+        self.crawl.plan("comics", 401, 410, unit_size=10)
+        with mock.patch.dict(crawl._FETCHERS, {"comics": mock.Mock(side_effect=download_comic_data)}):
+            self.assertEqual(self.crawl.work(), 1)
+            self.assertEqual(crawl._FETCHERS["comics"].call_count, 10)
+        self.assertEqual([number for number, _ in self.crawl.results("comics")], [401, 402, 403, 405, 406, 407, 408, 409, 410])
+
+    def test_failed_numbers_are_retried(self):
+        self.crawl.plan("comics", 401, 410, unit_size=10)
+        flaky.add(407)
+        self.assertEqual(self.crawl.work(max_units=1), 0)
+        unit = self.crawl.claim()
+        self.assertEqual(self.crawl.get_pending_numbers(unit), [407])
+        self.crawl.release(unit)
+        self.assertEqual(self.crawl.work(), 1)
+        self.assertEqual(len(list(self.crawl.results("comics"))), 9)
+        self.assertEqual(self.crawl.progress()["done"], 1)
+
+    def test_failures_are_kept_apart(self):
+        self.crawl.plan("comics", 401, 410, unit_size=10)
+        def broken_download(number):
+            if number == 407:
+                raise ConnectionError("down")
+            return download_comic_data(number)
+
+        with mock.patch.dict(crawl._FETCHERS, {"comics": broken_download}):
+            self.assertEqual(self.crawl.work(max_attempts=2), 1)
+        self.assertEqual(self.crawl.progress(), {"pending": 0, "leased": 0, "done": 1, "failed": 1})
+        self.assertEqual([number for number, _ in self.crawl.failures("comics")], [407])
+        self.assertNotIn(407, [number for number, _ in self.crawl.results("comics")])
+
+        self.assertEqual(self.crawl.retry_failures(), 1)
+        self.assertEqual(self.crawl.work(), 1)
+        self.assertEqual(list(self.crawl.failures("comics")), [])
+        self.assertIn(407, [number for number, _ in self.crawl.results("comics")])
+
+    def test_slow_fetch_keeps_lease(self):
+        self.crawl.plan("comics", 1, 2, unit_size=2)
+        short = xkcd.Crawl(self.path, lease_seconds=0.3)
+        claims = []
+
+        def slow_download(number):
+            time.sleep(0.4)
+            claims.append(self.crawl.claim("other"))
+            return download_comic_data(number)
+
+        with mock.patch.dict(crawl._FETCHERS, {"comics": slow_download}):
+            self.assertEqual(short.work(max_workers=1), 1)
+        self.assertEqual(claims, [None, None])
+        self.assertEqual(self.crawl.progress()["done"], 1)
+
+    def test_multiple_processes(self):
+        self.crawl.plan("comics", 1, 200, unit_size=10)
+        with get_context("spawn").Pool(3) as pool:
+            committed = pool.starmap(run_worker, [(self.path, f"worker-{index}") for index in range(3)])
+        self.assertEqual(sum(committed), 20)
+        self.assertEqual([number for number, _ in self.crawl.results("comics")], list(range(1, 201)))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,186 @@
+"""
+MIT License
+
+Copyright (c) 2025 Omkaar
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+# pylint: skip-file
+import os
+import unittest
+from datetime import date
+from threading import Event
+from unittest import mock
+
+import xkcd
+from xkcd import client, daemon, search_comics, get_comic_from_date, search_articles
+
+COMICS = {
+    number: {
+        "num": number, "year": "2006", "month": "1", "day": str(number),
+        "safe_title": f"Comic {number}", "title": f"Comic {number}", "transcript": "",
+        "img": f"https://imgs.xkcd.com/comics/comic_{number}.png", "alt": "python" if number % 2 else "snake"
+    } for number in range(1, 11)
+}
+
+PAGE = """<html><body>
+<h2 id="title"><a href="/{0}">Article {0}</a></h2>
+<p id="question">Question {0}?</p>
+<p id="attribute">—Author {0}</p>
+<article id="entry"><p>Answer about {1}.</p></article>
+</body></html>"""
+
+def download_comic_data(number=None):
+    return COMICS[number or 10]
+
+def download_article_page(number):
+    return PAGE.format(number, '<a href="https://xkcd.com/5/">rockets</a> on <a href="https://en.wikipedia.org/wiki/Rocket">Wikipedia</a>' if number == 2 else "oceans")
+
+class TestDaemon(unittest.TestCase):
+    def setUp(self):
+        patches = [
+            mock.patch.object(daemon, "_download_comic_data", side_effect=download_comic_data),
+            mock.patch.object(daemon, "_download_article_page", side_effect=download_article_page),
+            mock.patch.object(daemon, "_download_latest_article_number", return_value=3),
+            mock.patch.object(xkcd.comic, "_download_comic_data", side_effect=AssertionError("network used")),
+            mock.patch.object(xkcd.what_if, "_download_article_page", side_effect=AssertionError("network used")),
+            mock.patch.object(xkcd.what_if, "_download_latest_article_number", side_effect=AssertionError("network used"))
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+        self.daemon = xkcd.Daemon(port=0)
+        self.daemon.start()
+        self.addCleanup(self.daemon.stop)
+        self.assertTrue(self.daemon.wait_until_loaded(5))
+        environ = mock.patch.dict(os.environ, {"XKCD_DAEMON_URL": self.daemon.url})
+        environ.start()
+        self.addCleanup(environ.stop)
+        client._probe_cache.clear()
+
+    def test_daemon_url(self):
+        self.assertEqual(client.get_daemon_url(), self.daemon.url)
+
+    def test_comic(self):
+        comic = xkcd.Comic(3)
+        self.assertEqual(comic.number, 3)
+        self.assertEqual(comic.date, date(2006, 1, 3))
+        self.assertEqual(xkcd.Comic().number, 10)
+
+    def test_search_comics(self):
+        report = xkcd.TaskReport()
+        numbers = sorted(comic.number for comic in search_comics("python", report=report))
+        self.assertEqual(numbers, [1, 3, 5, 7, 9])
+        self.assertEqual([result.item for result in report.successes], [1, 3, 5, 7, 9])
+
+    def test_get_comic_from_date(self):
+        comics = list(get_comic_from_date(date(2006, 1, 4)))
+        self.assertEqual([comic.number for comic in comics], [4])
+
+    def test_article(self):
+        article = xkcd.WhatIfArticle(2)
+        self.assertEqual(article.title, "Article 2")
+        self.assertEqual(article.author, "Author 2")
+        self.assertEqual(xkcd.WhatIfArticle().number, 3)
+
+    def test_search_articles(self):
+        report = xkcd.TaskReport()
+        articles = list(search_articles("rockets", report=report))
+        self.assertEqual([result.value for result in report.successes], articles)
+        self.assertEqual([article.number for article in articles], [2])
+        self.assertEqual(self.daemon.references.articles, {1, 2, 3})
+
+    def test_transient_failures_are_not_cached(self):
+        with mock.patch.object(daemon, "_download_comic_data", side_effect=[ConnectionError("blip"), dict(COMICS[5], num=11)]) as download:
+            with self.assertRaises(ConnectionError):
+                self.daemon.get_comic(11)
+            self.assertEqual(self.daemon.get_comic(11)["num"], 11)
+            self.assertEqual(self.daemon.get_comic(11)["num"], 11)
+        self.assertEqual(download.call_count, 2)
+
+    def test_missing_comics_are_cached(self):
+        with mock.patch.object(daemon, "_download_comic_data", return_value=None) as download:
+            self.assertIsNone(self.daemon.get_comic(404))
+            self.assertIsNone(self.daemon.get_comic(404))
+        self.assertEqual(self.daemon.handle("/comics/404", {})[0], 404)
+        self.assertEqual(download.call_count, 1)
+
+    def test_cold_daemon_answers_503(self):
+        release = Event()
+
+        def slow_download(number=None):
+            release.wait(5)
+            return download_comic_data(number)
+
+        with mock.patch.object(daemon, "_download_comic_data", side_effect=slow_download):
+            cold = xkcd.Daemon(port=0)
+            cold.start()
+            try:
+                self.assertEqual(cold.handle("/comics/search", {"q": "python"})[0], 503)
+                self.assertEqual(cold.handle("/comics/date", {"date": "2006-01-01"})[0], 503)
+                release.set()
+                self.assertTrue(cold.wait_until_loaded(5))
+                status, results = cold.handle("/comics/search", {"q": "python"})
+                self.assertEqual((status, len(results)), (200, 5))
+            finally:
+                release.set()
+                cold.stop()
+
+    def test_references(self):
+        self.assertEqual(client.get_daemon_backlinks("comics", 5), {2})
+        self.assertEqual(client.get_daemon_backlinks("comics", 6), frozenset())
+        self.assertEqual(client.get_daemon_backlinks("domains", "en.wikipedia.org"), {2})
+        self.assertEqual(client.get_daemon_links(2), {"comics": [5], "articles": [], "domains": ["en.wikipedia.org"]})
+        self.assertIsNone(client.get_daemon_links(7))
+        with self.assertRaises(ValueError):
+            client.get_daemon_backlinks("images", 1)
+
+    def test_failed_load_keeps_answering_503(self):
+        failing = {5}
+
+        def flaky_download(number=None):
+            if number in failing:
+                raise ConnectionError("offline")
+            return download_comic_data(number)
+
+        with mock.patch.object(daemon, "_download_comic_data", side_effect=flaky_download):
+            cold = xkcd.Daemon(port=0)
+            cold.start()
+            try:
+                self.assertFalse(cold.wait_until_loaded(1))
+                self.assertEqual(cold.handle("/comics/search", {"q": "python"})[0], 503)
+                self.assertEqual(cold.handle("/comics/date", {"date": "2006-01-05"})[0], 503)
+                failing.clear()
+                cold.handle("/comics/search", {"q": "python"})
+                self.assertTrue(cold.wait_until_loaded(5))
+                status, results = cold.handle("/comics/date", {"date": "2006-01-05"})
+                self.assertEqual((status, [data["num"] for data in results]), (200, [5]))
+            finally:
+                cold.stop()
+
+    def test_no_daemon(self):
+        with mock.patch.dict(os.environ, {"XKCD_DAEMON_URL": ""}):
+            self.assertIsNone(client.get_daemon_url())
+            self.assertIsNone(client.daemon_request("comics/1"))
+
+if __name__ == "__main__":
+    unittest.main()
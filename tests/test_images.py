@@ -0,0 +1,157 @@
+"""
+MIT License
+
+Copyright (c) 2025 Omkaar
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+# pylint: skip-file
+import os
+import socket
+import tempfile
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+
+import xkcd
+
+IMAGES = {f"/comics/{name}.png": bytes([index]) * 1000 for index, name in enumerate(["a", "b", "c", "d"])}
+
+class StubImages(BaseHTTPRequestHandler):
+    requests = []
+
+    def do_GET(self):
+        StubImages.requests.append(self.path)
+        body = IMAGES.get(self.path)
+        self.send_response(200 if body else 404)
+        self.send_header("Content-Length", str(len(body or b"")))
+        self.end_headers()
+        self.wfile.write(body or b"")
+
+    def log_message(self, *args):
+        pass
+
+class TestImageCache(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), StubImages)
+        Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}/comics/"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        StubImages.requests = []
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def test_memory_budget(self):
+        cache = xkcd.ImageCache(2500)
+        for name in "abc":
+            self.assertEqual(bytes(cache.get(f"{self.base_url}{name}.png")), IMAGES[f"/comics/{name}.png"])
+        self.assertEqual(cache.memory_bytes, 2000)
+        self.assertNotIn(f"{self.base_url}a.png", cache)
+        self.assertIn(f"{self.base_url}c.png", cache)
+        cache.get(f"{self.base_url}c.png")
+        self.assertEqual(len(StubImages.requests), 3)
+
+    def test_disk_tier(self):
+        cache = xkcd.ImageCache(1000, directory=self.directory, max_disk_bytes=3000)
+        for name in "abcd":
+            cache.get(f"{self.base_url}{name}.png")
+        self.assertEqual(cache.disk_bytes, 3000)
+        self.assertEqual(len(os.listdir(self.directory)), 3)
+        data = cache.get(f"{self.base_url}b.png")
+        self.assertTrue(data.readonly)
+        self.assertEqual(bytes(data), IMAGES["/comics/b.png"])
+        self.assertEqual(len(StubImages.requests), 4)
+        reopened = xkcd.ImageCache(0, directory=self.directory)
+        self.assertIn(f"{self.base_url}d.png", reopened)
+
+    def test_directory_scan(self):
+        cache = xkcd.ImageCache(directory=self.directory)
+        cache.get(f"{self.base_url}a.png")
+        for name in ("notes.txt", "tmpabc.part"):
+            with open(os.path.join(self.directory, name), "wb") as file:
+                file.write(b"x" * 5000)
+        reopened = xkcd.ImageCache(directory=self.directory, max_disk_bytes=1000)
+        self.assertEqual(reopened.disk_bytes, 1000)
+        self.assertIn(f"{self.base_url}a.png", reopened)
+        names = os.listdir(self.directory)
+        self.assertEqual(len(names), 2)
+        self.assertIn("notes.txt", names)
+        self.assertNotIn("tmpabc.part", names)
+
+    def test_stream_miss(self):
+        cache = xkcd.ImageCache(directory=self.directory, chunk_size=256)
+        chunks = list(cache.stream(f"{self.base_url}a.png"))
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(b"".join(chunks), IMAGES["/comics/a.png"])
+        self.assertEqual(b"".join(cache.stream(f"{self.base_url}a.png")), IMAGES["/comics/a.png"])
+        self.assertEqual(len(StubImages.requests), 1)
+
+    def test_abandoned_stream(self):
+        cache = xkcd.ImageCache(directory=self.directory, chunk_size=256)
+        stream = cache.stream(f"{self.base_url}a.png")
+        next(stream)
+        stream.close()
+        self.assertNotIn(f"{self.base_url}a.png", cache)
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_open_sendfile(self):
+        cache = xkcd.ImageCache(directory=self.directory)
+        left, right = socket.socketpair()
+        with left, right, cache.open(f"{self.base_url}c.png") as file:
+            left.sendfile(file)
+            left.shutdown(socket.SHUT_WR)
+            received = b""
+            while len(received) < 1000:
+                received += right.recv(4096)
+        self.assertEqual(received, IMAGES["/comics/c.png"])
+
+    def test_open_image_larger_than_disk(self):
+        cache = xkcd.ImageCache(100, directory=self.directory, max_disk_bytes=500)
+        with cache.open(f"{self.base_url}b.png") as file:
+            self.assertEqual(file.read(), IMAGES["/comics/b.png"])
+        self.assertEqual(cache.disk_bytes, 0)
+
+    def test_open_evicted_image(self):
+        cache = xkcd.ImageCache(directory=self.directory)
+        cache.get(f"{self.base_url}d.png")
+        for name in os.listdir(self.directory):
+            os.remove(os.path.join(self.directory, name))
+        with cache.open(f"{self.base_url}d.png") as file:
+            self.assertEqual(file.read(), IMAGES["/comics/d.png"])
+        self.assertEqual(len(StubImages.requests), 2)
+        self.assertEqual(cache.disk_bytes, 1000)
+
+    def test_missing_image(self):
+        cache = xkcd.ImageCache(directory=self.directory)
+        with self.assertRaises(Exception):
+            cache.get(f"{self.base_url}missing.png")
+        self.assertEqual(os.listdir(self.directory), [])
+
+if __name__ == "__main__":
+    unittest.main()
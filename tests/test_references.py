@@ -0,0 +1,85 @@
+"""
+MIT License
+
+Copyright (c) 2025 Omkaar
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+# pylint: skip-file
+import os
+import tempfile
+import unittest
+
+import xkcd
+
+PAGE = """<html><body>
+<h2 id="title"><a href="/{number}">Article {number}</a></h2>
+<p id="question">Question?</p>
+<article id="entry"><p>{body}</p></article>
+</body></html>"""
+
+def make_article(number, body):
+    return xkcd.WhatIfArticle.from_page(number, PAGE.format(number=number, body=body))
+
+ARTICLE_1 = make_article(1, (
+    'See <a href="https://xkcd.com/353/">this comic</a> and <a href="/2/">another article</a>'
+    '<span class="ref"><span class="refnum">[1]</span><span class="refbody">Per <a href="https://www.Wikipedia.org/wiki/Python">Wikipedia</a>.</span></span>'
+))
+ARTICLE_2 = make_article(2, (
+    'Like <a href="//xkcd.com/353">Python</a> and <a href="https://what-if.xkcd.com/1/">the first one</a>,'
+    ' <a href="https://xkcd.com/">the home page</a> and <a href="/2/">itself</a>.'
+))
+
+class TestCrossReferences(unittest.TestCase):
+    def setUp(self):
+        self.references = xkcd.build_cross_references([ARTICLE_1, ARTICLE_2])
+
+    def test_outlinks(self):
+        self.assertEqual(self.references.get_outlinks(1), xkcd.Links([353], [2], ["wikipedia.org"]))
+        self.assertEqual(self.references.get_outlinks(2), xkcd.Links([353], [1], []))
+        self.assertIsNone(self.references.get_outlinks(3))
+
+    def test_backlinks(self):
+        self.assertEqual(self.references.get_comic_backlinks(353), {1, 2})
+        self.assertEqual(self.references.get_article_backlinks(2), {1})
+        self.assertEqual(self.references.get_domain_backlinks("www.wikipedia.org"), {1})
+        self.assertEqual(self.references.get_comic_backlinks(1), frozenset())
+
+    def test_incremental_update(self):
+        self.references.add(make_article(1, 'Now only <a href="https://xkcd.com/1000/">this</a>.'))
+        self.assertEqual(self.references.get_comic_backlinks(353), {2})
+        self.assertEqual(self.references.get_comic_backlinks(1000), {1})
+        self.assertEqual(self.references.get_domain_backlinks("wikipedia.org"), frozenset())
+        self.references.remove(2)
+        self.assertEqual(self.references.get_comic_backlinks(353), frozenset())
+        self.assertEqual(self.references.articles, {1})
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "references.json")
+            self.references.save(path)
+            loaded = xkcd.CrossReferences.load(path)
+        self.assertEqual(len(loaded), 2)
+        self.assertEqual(loaded.get_outlinks(1), self.references.get_outlinks(1))
+        self.assertEqual(loaded.get_comic_backlinks(353), {1, 2})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,161 @@
+"""
+MIT License
+
+Copyright (c) 2025 Omkaar
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+# pylint: skip-file
+import time
+import unittest
+from datetime import date
+from threading import Event, Lock
+from unittest import mock
+from urllib.error import URLError
+
+import xkcd
+from xkcd import TaskExecutor, TaskReport
+
+class TestTaskExecutor(unittest.TestCase):
+    def test_results_and_failures(self):
+        def task(number):
+            if number % 3 == 0:
+                raise ValueError(number)
+            return number * 2
+
+        report = TaskExecutor(4).run(task, range(1, 11))
+        self.assertEqual(len(report), 10)
+        self.assertEqual([result.item for result in report.successes], [1, 2, 4, 5, 7, 8, 10])
+        self.assertEqual([result.value for result in report.successes], [2, 4, 8, 10, 14, 16, 20])
+        self.assertEqual([result.item for result in report.failures], [3, 6, 9])
+        self.assertIsInstance(report.failures[0].error, ValueError)
+        self.assertEqual(sorted(report.durations), list(range(1, 11)))
+        with self.assertRaises(RuntimeError):
+            report.raise_for_failures()
+
+    def test_bounded_concurrency(self):
+        lock = Lock()
+        running = 0
+        peak = 0
+        consumed = []
+
+        def items():
+            for number in range(20):
+                consumed.append(number)
+                yield number
+
+        def task(number):
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            time.sleep(0.01)
+            with lock:
+                running -= 1
+
+        stream = TaskExecutor(3).stream(task, items())
+        next(stream)
+        self.assertLessEqual(len(consumed), 4)
+        stream.close()
+        self.assertLessEqual(peak, 3)
+
+    def test_timeout(self):
+        def task(seconds):
+            time.sleep(seconds)
+            return seconds
+
+        report = TaskExecutor(2, timeout=0.2).run(task, [0.0, 1.0, 0.05])
+        self.assertEqual([result.item for result in report.successes], [0.0, 0.05])
+        self.assertEqual(len(report.failures), 1)
+        self.assertIsInstance(report.failures[0].error, TimeoutError)
+        self.assertLess(report.elapsed, 0.9)
+
+    def test_hung_tasks_do_not_block(self):
+        release = Event()
+
+        def task(number):
+            if number < 2:
+                release.wait(8)
+            return number
+
+        started = time.monotonic()
+        try:
+            report = TaskExecutor(2, timeout=0.3).run(task, range(6))
+        finally:
+            release.set()
+        self.assertLess(time.monotonic() - started, 2)
+        self.assertEqual([result.item for result in report.successes], [2, 3, 4, 5])
+        self.assertEqual([result.item for result in report.failures], [0, 1])
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            TaskExecutor(0)
+        with self.assertRaises(ValueError):
+            TaskExecutor(timeout=0)
+
+class TestFanOutHelpers(unittest.TestCase):
+    def setUp(self):
+        patch = mock.patch.object(xkcd.comic, "daemon_request", return_value=None)
+        patch.start()
+        self.addCleanup(patch.stop)
+        patch = mock.patch.object(xkcd.what_if, "daemon_request", return_value=None)
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def test_search_articles_reports_network_errors(self):
+        timeouts = set()
+
+        def fetch(number, timeout=None):
+            timeouts.add(timeout)
+            if number == 2:
+                raise URLError("unreachable")
+            return f"""<h2 id="title"><a href="/{number}">Article {number}</a></h2><p id="question">Rockets?</p><article id="entry"><p>Rockets.</p></article>"""
+
+        report = TaskReport()
+        with mock.patch.object(xkcd.what_if, "_download_latest_article_number", return_value=3), \
+                mock.patch.object(xkcd.what_if, "_download_article_page", side_effect=fetch):
+            articles = list(xkcd.search_articles("rockets", timeout=5, report=report))
+        self.assertEqual(sorted(article.number for article in articles), [1, 3])
+        self.assertEqual([result.item for result in report.failures], [2])
+        self.assertIsInstance(report.failures[0].error, URLError)
+        self.assertEqual(timeouts, {5})
+
+    def test_get_comic_from_date_stops_after_date(self):
+        fetched = []
+
+        def fetch(number=None, timeout=None):
+            if number is None:
+                number = 100
+            fetched.append(number)
+            return {
+                "num": number, "year": "2006", "month": "1", "day": str(min(number, 28)), "safe_title": "",
+                "title": "", "transcript": "", "img": "https://imgs.xkcd.com/comics/a.png", "alt": ""
+            }
+
+        report = TaskReport()
+        with mock.patch.object(xkcd.comic, "_download_comic_data", side_effect=fetch):
+            comics = list(xkcd.get_comic_from_date(date(2006, 1, 5), max_workers=2, report=report))
+        self.assertEqual([comic.number for comic in comics], [5])
+        self.assertEqual(report.failures, [])
+        self.assertLess(len(fetched), 20)
+
+if __name__ == "__main__":
+    unittest.main()
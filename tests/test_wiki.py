@@ -0,0 +1,144 @@
+"""
+MIT License
+
+Copyright (c) 2025 Omkaar
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+# pylint: skip-file
+
+import json
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+from urllib.parse import urlparse, parse_qs
+
+import xkcd
+
+PAGE = """{{comic
+| number = %d
+}}
+==Explanation==
+{{incomplete|Needs more [[Python]].}}
+This comic is about '''[[Python (programming language)|Python]]'''.<ref>A footnote.</ref>
+
+It uses [https://example.com an example].
+==Transcript==
+:[Cueball is flying.]
+"""
+
+class StubWiki(BaseHTTPRequestHandler):
+    requests = []
+    failing = set()
+
+    def do_GET(self):
+        params = {key: value[0] for key, value in parse_qs(urlparse(self.path).query).items()}
+        StubWiki.requests.append(params)
+        titles = params["titles"].split("|")
+        if StubWiki.failing & set(titles):
+            self.send_response(500)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if "rvcontinue" in params:
+            titles = titles[len(titles) // 2:]
+            data = {}
+        else:
+            data = {"continue": {"rvcontinue": "1", "continue": "||"}} if len(titles) > 1 else {}
+            titles = titles[:len(titles) // 2] if len(titles) > 1 else titles
+        pages = []
+        for title in titles:
+            if int(title) > 100:
+                pages.append({"title": title, "missing": True})
+            else:
+                pages.append({"title": f"{title}: Comic {title}", "revisions": [{"slots": {"main": {"content": PAGE % int(title)}}}]})
+        data["query"] = {"pages": pages}
+        body = json.dumps(data).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+class TestWiki(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), StubWiki)
+        Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.api_url = f"http://127.0.0.1:{cls.server.server_address[1]}/wiki/api.php"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        StubWiki.requests = []
+        StubWiki.failing = set()
+
+    def test_batched_requests(self):
+        wiki = xkcd.Wiki(self.api_url, batch_size=50)
+        explanations = wiki.get_explanations(range(1, 101))
+        self.assertEqual(len(explanations), 100)
+        self.assertEqual(len([params for params in StubWiki.requests if "rvcontinue" not in params]), 2)
+        self.assertTrue(all(isinstance(explanation, xkcd.Explanation) for explanation in explanations.values()))
+
+    def test_explanation_parsing(self):
+        explanation = xkcd.Wiki(self.api_url).get_explanation(53)
+        self.assertEqual(explanation.number, 53)
+        self.assertEqual(explanation.title, "53: Comic 53")
+        self.assertTrue(explanation.incomplete)
+        self.assertEqual(explanation.text, "This comic is about Python.\n\nIt uses an example.")
+        self.assertTrue(explanation.url.endswith("/wiki/index.php/53:_Comic_53"))
+
+    def test_missing_page(self):
+        self.assertIsNone(xkcd.Wiki(self.api_url).get_explanation(1000))
+
+    def test_cache(self):
+        wiki = xkcd.Wiki(self.api_url)
+        wiki.get_explanations([1, 2, 3])
+        count = len(StubWiki.requests)
+        wiki.get_explanations([3, 2, 1])
+        self.assertEqual(len(StubWiki.requests), count)
+        wiki.clear_cache()
+        wiki.get_explanation(1)
+        self.assertGreater(len(StubWiki.requests), count)
+
+    def test_failed_batch_keeps_others(self):
+        wiki = xkcd.Wiki(self.api_url, batch_size=10)
+        StubWiki.failing = {"25"}
+        with self.assertRaises(RuntimeError):
+            wiki.get_explanations(range(1, 31))
+        StubWiki.failing = set()
+        StubWiki.requests = []
+        explanations = wiki.get_explanations(range(1, 31))
+        self.assertEqual(len(explanations), 30)
+        self.assertEqual({params["titles"] for params in StubWiki.requests}, {"|".join(str(number) for number in range(21, 31))})
+
+    def test_invalid_batch_size(self):
+        with self.assertRaises(ValueError):
+            xkcd.Wiki(self.api_url, batch_size=51)
+
+if __name__ == "__main__":
+    unittest.main()
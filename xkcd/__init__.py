@@ -18,3 +18,10 @@ __version__ = "1.3.0"
 
 from .comic import *
 from .what_if import *
+from .wiki import *
+from .daemon import Daemon
+from .references import *
+from .images import ImageCache
+from .crawl import Crawl, WorkUnit, plan_archive_crawl
+from .tasks import TaskExecutor, TaskReport, TaskResult
+from .client import get_daemon_backlinks, get_daemon_links
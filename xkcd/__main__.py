@@ -0,0 +1,50 @@
+"""
+MIT License
+
+Copyright (c) 2025 Omkaar
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+from sys import argv, exit as exit_with
+from typing import Optional, Callable, Dict, List
+
+from .crawl import main as run_crawl
+from .daemon import main as run_daemon
+
+
+COMMANDS: Dict[str, Callable[[List[str]], None]] = {
+    "crawl": run_crawl,
+    "daemon": run_daemon
+}
+
+
+def main(arguments: Optional[List[str]] = None) -> None:
+    """
+    Runs a command from the command line, e.g. ``python -m xkcd daemon --preload``.
+    """
+    arguments = argv[1:] if arguments is None else arguments
+    if not arguments or arguments[0] not in COMMANDS:
+        print(f"usage: python -m xkcd {{{','.join(COMMANDS)}}} ...")
+        exit_with(2)
+    COMMANDS[arguments[0]](arguments[1:])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+MIT License
+
+Copyright (c) 2025 Omkaar
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+from os import environ
+from socket import create_connection
+from threading import Lock
+from time import monotonic
+from typing import Optional, Any, Dict, FrozenSet, List, Union
+from urllib.parse import quote, urlparse
+
+from requests import get
+from requests.exceptions import RequestException
+
+
+XKCD_DAEMON_URL = "http://127.0.0.1:7353/"
+
+_PROBE_INTERVAL = 5.0
+_REQUEST_TIMEOUT = 30.0
+_probe_lock = Lock()
+_probe_cache = {}
+
+
+def get_daemon_url() -> Optional[str]:
+    """
+    Gets the URL of the local query daemon if one is running.
+
+    The address is read from the ``XKCD_DAEMON_URL`` environment variable and defaults
+    to ``http://127.0.0.1:7353/``. Setting the variable to an empty string disables the daemon.
+
+    :return: The daemon's URL, or ``None`` if no daemon is reachable.
+    """
+    url = environ.get("XKCD_DAEMON_URL", XKCD_DAEMON_URL)
+    if not url:
+        return None
+    if not url.endswith("/"):
+        url += "/"
+
+    with _probe_lock:
+        checked, available = _probe_cache.get(url, (None, False))
+        if checked is not None and monotonic() - checked < _PROBE_INTERVAL:
+            return url if available else None
+
+    parsed = urlparse(url)
+    try:
+        create_connection((parsed.hostname, parsed.port or 80), timeout=0.1).close()
+        available = True
+    except OSError:
+        available = False
+
+    with _probe_lock:
+        _probe_cache[url] = (monotonic(), available)
+    return url if available else None
+
+def daemon_request(path: str, **params: Any) -> Optional[Any]:
+    """
+    Sends a query to the local daemon.
+
+    :param path: The path of the query, relative to the daemon's URL.
+    :type path: :class:`str`
+    :return: The decoded JSON response, or ``None`` if no daemon is running or the query failed.
+    """
+    url = get_daemon_url()
+    if url is None:
+        return None
+    try:
+        response = get(f"{url}{path}", params=params, timeout=_REQUEST_TIMEOUT)
+        if response.status_code != 200:
+            return None
+        return response.json()
+    except (RequestException, ValueError):
+        with _probe_lock:
+            _probe_cache.pop(url, None)
+        return None
+
+def get_daemon_backlinks(kind: str, key: Union[int, str]) -> Optional[FrozenSet[int]]:
+    """
+    Gets the What If articles that link to a comic, an article or an external domain from the local daemon.
+
+    :param kind: Either ``"comics"``, ``"articles"`` or ``"domains"``.
+    :type kind: :class:`str`
+    :param key: The number of the comic or article, or the domain.
+    :type key: Union[:class:`int`, :class:`str`]
+    :return: The numbers of the linking articles, or ``None`` if no daemon answered.
+    """
+    if kind not in ("comics", "articles", "domains"):
+        raise ValueError(f"Invalid kind: {kind!r}")
+    response = daemon_request(f"{kind}/{quote(str(key), safe='')}/backlinks")
+    return None if response is None else frozenset(response)
+
+def get_daemon_links(number: int) -> Optional[Dict[str, List[Union[int, str]]]]:
+    """
+    Gets the outgoing links of a What If article from the local daemon.
+
+    :param number: The number of the article.
+    :type number: :class:`int`
+    :return: A dictionary with the keys ``"comics"``, ``"articles"`` and ``"domains"``, or ``None`` if no daemon answered or the article is not indexed.
+    """
+    return daemon_request(f"articles/{int(number)}/links")
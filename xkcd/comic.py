@@ -31,14 +31,21 @@ from urllib.parse import urlparse
 from typing import Optional, Generator, Union
 from subprocess import run
 from platform import system
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from threading import Lock
 
 from requests import get
 
+from .client import daemon_request
+from .images import ImageCache
+from .tasks import TaskExecutor, TaskReport, _record
+from .wiki import Explanation, get_explanation
+
 
 XKCD_BASE_URL = "https://xkcd.com/"
 XKCD_WIKI_BASE_URL = "https://explainxkcd.com/"
 
+_image_cache = ImageCache()
+
 
 class Comic:
 
@@ -89,17 +96,29 @@ class Comic:
 
         try:
             if random:
-                response = get(f"{XKCD_BASE_URL}info.0.json").json()
-                latest = int(response["num"])
-                self.number = randint(1, latest)
-                response = get(f"{XKCD_BASE_URL}{self.number}/info.0.json").json()
+                latest = int(_fetch_comic_data()["num"])
+                response = _fetch_comic_data(randint(1, latest))
             else:
-                request_url = f"{XKCD_BASE_URL}info.0.json" if number is None else f"{XKCD_BASE_URL}{number}/info.0.json"
-                response = get(request_url).json()
-                self.number = int(response["num"])
+                response = _fetch_comic_data(number)
         except Exception as e:
             raise RuntimeError(f"Failed to fetch comic data: {e}") from e
 
+        self._load(response)
+
+    @classmethod
+    def from_data(cls, data: dict) -> "Comic":
+        """
+        Creates a comic from its metadata without fetching it.
+
+        :param data: The comic's metadata, as returned by xkcd's JSON API.
+        :type data: :class:`dict`
+        """
+        comic = cls.__new__(cls)
+        comic._load(data)
+        return comic
+
+    def _load(self, response: dict) -> None:
+        self.number = int(response["num"])
         self.date = date(int(response["year"]), int(response["month"]), int(response["day"]))
         self.safe_title = response["safe_title"]
         self.title = response["title"]
@@ -137,11 +156,30 @@ class Comic:
         else:
             filename = f"./{filename}"
 
-        with open(filename, "wb") as file:
-            file.write(get(self.image.url).content)
+        with get(self.image.url, stream=True) as response, open(filename, "wb") as file:
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                file.write(chunk)
 
         return filename
 
+    def read_image(self, *, cache: Optional[ImageCache] = None) -> memoryview:
+        """
+        Gets the comic image's bytes through an image cache.
+
+        :param cache: The cache to use. If not specified, uses a shared in-memory cache.
+        :type cache: Optional[:class:`ImageCache`]
+        :return: A read-only view of the image's bytes.
+        """
+        return (cache or _image_cache).get(self.image.url)
+
+    def explain(self) -> Optional[Explanation]:
+        """
+        Gets the comic's explanation from explainxkcd.
+
+        :return: The explanation, or ``None`` if the comic has no wiki page.
+        """
+        return get_explanation(self.number)
+
     def show(self, *, filename: Optional[str] = None, path: Optional[str] = None) -> None:
         """
         Downloads the comic and opens the image in the default image viewer.
@@ -151,6 +189,25 @@ class Comic:
         """
         run(['open' if system() == 'Darwin' else 'xdg-open' if system() == 'Linux' else 'start', self.download(filename=filename, path=path)], shell=True, check=False)
 
+def _download_comic_data(number: Optional[int] = None, *, timeout: Optional[float] = 30) -> Optional[dict]:
+    request_url = f"{XKCD_BASE_URL}info.0.json" if number is None else f"{XKCD_BASE_URL}{number}/info.0.json"
+    response = get(request_url, timeout=timeout)
+    if response.status_code == 404:
+        return None
+    response.raise_for_status()
+    return response.json()
+
+def _fetch_comic_data(number: Optional[int] = None, *, timeout: Optional[float] = 30) -> dict:
+    response = daemon_request("comics/latest" if number is None else f"comics/{number}")
+    if response is None:
+        response = _download_comic_data(number, timeout=timeout)
+    if response is None:
+        raise ValueError(f"Comic {number} does not exist.")
+    return response
+
+def _comic_text(comic: Comic) -> str:
+    return "".join([str(comic.number), str(comic.date), comic.title, comic.safe_title, comic.image.url, comic.image.alt, comic.transcript, comic.url, comic.wiki_url]).lower()
+
 def stream_comics(start: int = 1, end: Optional[int] = None) -> Generator[Comic, None, None]:
     """
     Streams comics from the specified start to end comic number.
@@ -158,8 +215,7 @@ def stream_comics(start: int = 1, end: Optional[int] = None) -> Generator[Comic,
     :param start: The starting comic number.
     :param end: The ending comic number. If not specified, streams until the latest comic.
     """
-    response = get(f"{XKCD_BASE_URL}info.0.json").json()
-    latest = int(response["num"])
+    latest = int(_fetch_comic_data()["num"])
     if start < 1 or (end is not None and end < start) or (end is not None and end > latest):
         raise ValueError(f"Invalid range: start={start}, end={end}")
 
@@ -168,77 +224,91 @@ def stream_comics(start: int = 1, end: Optional[int] = None) -> Generator[Comic,
     for number in range(start, end + 1):
         yield Comic(number)
 
-def get_comic_from_date(release_date: Union[datetime, date], *, max_workers: Optional[int] = 32) -> Optional[Generator[Comic, None, None]]:
+def get_comic_from_date(release_date: Union[datetime, date], *, max_workers: Optional[int] = 32, timeout: Optional[float] = None, report: Optional[TaskReport] = None) -> Optional[Generator[Comic, None, None]]:
     """
     Gets a comic by its date if it exists.
 
     .. note::
 
         The comics returned may not be in chronological order due to multithreading.
+        If a local query daemon is running, the results are taken from its in-memory index.
 
     :param release_date: The date of the comic to fetch.
     :type release_date: :class:`datetime.datetime` or :class:`datetime.date`
     :param max_workers: The maximum number of threads to use for fetching comics.
     :type max_workers: Optional[:class:`int`]
+    :param timeout: The number of seconds after which fetching a comic is given up on. It is also used as the HTTP timeout, which is 30 seconds by default.
+    :type timeout: Optional[:class:`float`]
+    :param report: A report to record the comics that were fetched or failed to be fetched in. If a local daemon answers, only the matching comics are recorded.
+    :type report: Optional[:class:`TaskReport`]
     """
     if isinstance(release_date, datetime):
         release_date = release_date.date()
-    latest = get(f"{XKCD_BASE_URL}info.0.json").json()["num"]
+
+    results = daemon_request("comics/date", date=release_date.isoformat())
+    if results is not None:
+        yield from _record((Comic.from_data(data) for data in results), report, lambda comic: comic.number)
+        return
+
+    latest = int(_fetch_comic_data()["num"])
     maximum = None
+    lock = Lock()
 
     def try_comic(number: int):
         nonlocal maximum
 
-        if maximum and number > maximum:
-            return None
-
-        try:
-            comic = Comic(number)
-            if comic.date > release_date:
-                maximum = number - 1
-            if comic.date == release_date:
-                return comic
-        except RuntimeError:
-            pass
-
+        with lock:
+            if maximum is not None and number > maximum:
+                return None
+
+        comic = Comic.from_data(_fetch_comic_data(number, timeout=timeout or 30))
+        if comic.date > release_date:
+            with lock:
+                if maximum is None or number - 1 < maximum:
+                    maximum = number - 1
+        if comic.date == release_date:
+            return comic
         return None
 
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = [executor.submit(try_comic, n) for n in range(1, latest + 1)]
-        for future in as_completed(futures):
-            result = future.result()
-            if result:
-                yield result
+    executor = TaskExecutor(max_workers, timeout=timeout)
+    for result in executor.stream(try_comic, range(1, latest + 1), report=report):
+        if result.value:
+            yield result.value
 
-def search_comics(query: str, *, max_workers: Optional[int] = 32) -> Generator[Comic, None, None]:
+def search_comics(query: str, *, max_workers: Optional[int] = 32, timeout: Optional[float] = None, report: Optional[TaskReport] = None) -> Generator[Comic, None, None]:
     """
     Searches for comics by title or alt text.
 
     .. note::
 
         The comics returned may not be in chronological order due to multithreading.
+        If a local query daemon is running, the results are taken from its in-memory index.
 
     :param query: The search query.
     :type query: :class:`str`
     :param max_workers: The maximum number of threads to use for fetching comics.
     :type max_workers: Optional[:class:`int`]
+    :param timeout: The number of seconds after which fetching a comic is given up on. It is also used as the HTTP timeout, which is 30 seconds by default.
+    :type timeout: Optional[:class:`float`]
+    :param report: A report to record the comics that were fetched or failed to be fetched in. If a local daemon answers, only the matching comics are recorded.
+    :type report: Optional[:class:`TaskReport`]
     """
     if not query:
         raise ValueError("Query must not be empty.")
 
     def try_comic(number: int):
-        try:
-            comic = Comic(number)
-            if query.lower() in "".join([str(comic.number), str(comic.date), comic.title, comic.safe_title, comic.image.url, comic.image.alt, comic.transcript, comic.url, comic.wiki_url]).lower():
-                return comic
-        except RuntimeError:
-            pass
+        comic = Comic.from_data(_fetch_comic_data(number, timeout=timeout or 30))
+        if query.lower() in _comic_text(comic):
+            return comic
         return None
 
-    latest = get(f"{XKCD_BASE_URL}info.0.json").json()["num"]
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = [executor.submit(try_comic, n) for n in range(1, latest + 1)]
-        for future in as_completed(futures):
-            result = future.result()
-            if result:
-                yield result
+    results = daemon_request("comics/search", q=query)
+    if results is not None:
+        yield from _record((Comic.from_data(data) for data in results), report, lambda comic: comic.number)
+        return
+
+    latest = int(_fetch_comic_data()["num"])
+    executor = TaskExecutor(max_workers, timeout=timeout)
+    for result in executor.stream(try_comic, range(1, latest + 1), report=report):
+        if result.value:
+            yield result.value
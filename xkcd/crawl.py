@@ -0,0 +1,462 @@
+"""
+MIT License
+
+Copyright (c) 2025 Omkaar
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+import sqlite3
+from argparse import ArgumentParser
+from contextlib import contextmanager
+from functools import partial
+from json import dumps, loads
+from os import getpid
+from socket import gethostname
+from threading import Event, Thread
+from time import time
+from typing import Optional, Callable, Dict, Generator, Iterator, List, Tuple, Any
+from uuid import uuid4
+
+from .comic import Comic, _download_comic_data
+from .tasks import TaskExecutor
+from .what_if import WhatIfArticle, _download_latest_article_number, _download_article_page
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS units (
+    kind TEXT NOT NULL,
+    start INTEGER NOT NULL,
+    end INTEGER NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    worker TEXT,
+    token TEXT,
+    expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (kind, start)
+);
+CREATE TABLE IF NOT EXISTS results (
+    kind TEXT NOT NULL,
+    number INTEGER NOT NULL,
+    data TEXT,
+    PRIMARY KEY (kind, number)
+);
+CREATE TABLE IF NOT EXISTS failures (
+    kind TEXT NOT NULL,
+    number INTEGER NOT NULL,
+    error TEXT NOT NULL,
+    PRIMARY KEY (kind, number)
+);
+"""
+
+_FETCHERS: Dict[str, Callable[[int], Any]] = {
+    "comics": _download_comic_data,
+    "articles": _download_article_page
+}
+
+
+class WorkUnit:
+
+    """
+    A class that represents a leased range of comic or article numbers.
+
+    :ivar kind: Either ``"comics"`` or ``"articles"``.
+    :ivar start: The first number of the range.
+    :ivar end: The last number of the range.
+    :ivar token: The token that identifies the lease.
+    :ivar expires: The time at which the lease expires, as a UNIX timestamp.
+    :ivar attempts: The number of times the unit has been claimed.
+    """
+
+    # The lease fields are keyword-only so that they cannot be mixed up with the range.
+    def __init__(self, kind: str, start: int, end: int, *, token: str, expires: float, attempts: int) -> None:  # pylint: disable=too-many-arguments
+        self.kind = kind
+        self.start = start
+        self.end = end
+        self.token = token
+        self.expires = expires
+        self.attempts = attempts
+
+    def __repr__(self) -> str:
+        return f"<WorkUnit kind={self.kind!r} start={self.start} end={self.end} attempts={self.attempts}>"
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(range(self.start, self.end + 1))
+
+
+class Crawl:
+
+    """
+    A class that coordinates a crawl of the archives between several workers.
+
+    Number ranges are split into work units that are stored in a SQLite database. Workers claim
+    units with a lease, fetch them and commit the results; units whose lease expires, e.g. because
+    their worker crashed, are handed to another worker. Workers on several hosts can share a crawl
+    if the database is on a file system that supports SQLite's locking.
+
+    :param path: The path of the SQLite database.
+    :type path: :class:`str`
+    :param lease_seconds: The number of seconds a claimed unit is leased for.
+    :type lease_seconds: Optional[:class:`float`]
+    """
+
+    def __init__(self, path: str, *, lease_seconds: Optional[float] = 300) -> None:
+        self.path = path
+        self.lease_seconds = lease_seconds
+        with self._connect() as connection:
+            connection.executescript(_SCHEMA)
+
+    def __repr__(self) -> str:
+        return f"<Crawl path={self.path!r}>"
+
+    @contextmanager
+    def _connect(self) -> Generator[sqlite3.Connection, None, None]:
+        connection = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+        try:
+            yield connection
+        finally:
+            connection.close()
+
+    @contextmanager
+    def _transaction(self) -> Generator[sqlite3.Connection, None, None]:
+        with self._connect() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield connection
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+
+    def plan(self, kind: str, start: int, end: int, *, unit_size: Optional[int] = 50) -> int:
+        """
+        Splits a range of numbers into work units. Units that already exist are kept.
+
+        :param kind: Either ``"comics"`` or ``"articles"``.
+        :type kind: :class:`str`
+        :param start: The first number of the range.
+        :type start: :class:`int`
+        :param end: The last number of the range.
+        :type end: :class:`int`
+        :param unit_size: The number of numbers per unit.
+        :type unit_size: Optional[:class:`int`]
+        :return: The number of units that were added.
+        """
+        if kind not in _FETCHERS:
+            raise ValueError(f"Invalid kind: {kind!r}")
+        if start < 1 or end < start or unit_size < 1:
+            raise ValueError(f"Invalid range: start={start}, end={end}")
+
+        units = [(kind, number, min(number + unit_size - 1, end)) for number in range(start, end + 1, unit_size)]
+        with self._transaction() as connection:
+            before = connection.total_changes
+            connection.executemany("INSERT OR IGNORE INTO units (kind, start, end) VALUES (?, ?, ?)", units)
+            return connection.total_changes - before
+
+    def claim(self, worker: Optional[str] = None) -> Optional[WorkUnit]:
+        """
+        Claims a pending unit, or a unit whose lease has expired.
+
+        :param worker: The name of the worker. If not specified, uses the host name and process ID.
+        :type worker: Optional[:class:`str`]
+        :return: The claimed unit, or ``None`` if no unit is available.
+        """
+        worker = worker or f"{gethostname()}:{getpid()}"
+        now = time()
+        with self._transaction() as connection:
+            row = connection.execute(
+                "SELECT kind, start, end, attempts FROM units WHERE status = 'pending' OR (status = 'leased' AND expires < ?) ORDER BY attempts, kind, start LIMIT 1",
+                (now,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            kind, start, end, attempts = row
+            unit = WorkUnit(kind, start, end, token=uuid4().hex, expires=now + self.lease_seconds, attempts=attempts + 1)
+            connection.execute(
+                "UPDATE units SET status = 'leased', worker = ?, token = ?, expires = ?, attempts = ? WHERE kind = ? AND start = ?",
+                (worker, unit.token, unit.expires, unit.attempts, kind, start)
+            )
+        return unit
+
+    def renew(self, unit: WorkUnit) -> bool:
+        """
+        Extends the lease of a unit.
+
+        :param unit: The unit.
+        :type unit: :class:`WorkUnit`
+        :return: Whether the lease was still held, or not.
+        """
+        expires = time() + self.lease_seconds
+        with self._transaction() as connection:
+            cursor = connection.execute(
+                "UPDATE units SET expires = ? WHERE kind = ? AND start = ? AND token = ? AND status = 'leased'",
+                (expires, unit.kind, unit.start, unit.token)
+            )
+        if cursor.rowcount:
+            unit.expires = expires
+        return bool(cursor.rowcount)
+
+    def commit(self, unit: WorkUnit, results: Dict[int, Any], *, done: Optional[bool] = True, failures: Optional[Dict[int, str]] = None) -> bool:
+        """
+        Stores the results of a unit and marks it as done.
+
+        Nothing is stored if the lease was lost to another worker in the meantime.
+
+        :param unit: The unit.
+        :type unit: :class:`WorkUnit`
+        :param results: A dictionary mapping each number to its JSON-serializable result, or ``None`` if it does not exist.
+        :type results: Dict[:class:`int`, Any]
+        :param done: Whether the unit is complete, or not. If ``False``, the results are stored and the unit is released so that its remaining numbers are fetched later.
+        :type done: Optional[:class:`bool`]
+        :param failures: A dictionary mapping numbers that could not be fetched to their errors. They are stored apart from the results, see :meth:`failures`.
+        :type failures: Optional[Dict[:class:`int`, :class:`str`]]
+        :return: Whether the results were stored, or not.
+        """
+        with self._transaction() as connection:
+            cursor = connection.execute(
+                "UPDATE units SET status = ?, worker = NULL, token = NULL, expires = NULL WHERE kind = ? AND start = ? AND token = ? AND status = 'leased'",
+                ("done" if done else "pending", unit.kind, unit.start, unit.token)
+            )
+            if not cursor.rowcount:
+                return False
+            connection.executemany(
+                "INSERT OR REPLACE INTO results (kind, number, data) VALUES (?, ?, ?)",
+                [(unit.kind, number, None if data is None else dumps(data)) for number, data in results.items()]
+            )
+            connection.executemany(
+                "DELETE FROM failures WHERE kind = ? AND number = ?",
+                [(unit.kind, number) for number in results]
+            )
+            connection.executemany(
+                "INSERT OR REPLACE INTO failures (kind, number, error) VALUES (?, ?, ?)",
+                [(unit.kind, number, error) for number, error in (failures or {}).items()]
+            )
+        return True
+
+    def get_pending_numbers(self, unit: WorkUnit) -> List[int]:
+        """
+        Gets the numbers of a unit that have no stored result yet.
+
+        :param unit: The unit.
+        :type unit: :class:`WorkUnit`
+        """
+        with self._connect() as connection:
+            stored = {number for (number,) in connection.execute("SELECT number FROM results WHERE kind = ? AND number BETWEEN ? AND ?", (unit.kind, unit.start, unit.end))}
+        return [number for number in unit if number not in stored]
+
+    def release(self, unit: WorkUnit) -> None:
+        """
+        Gives up the lease of a unit so that another worker can claim it.
+
+        :param unit: The unit.
+        :type unit: :class:`WorkUnit`
+        """
+        with self._transaction() as connection:
+            connection.execute(
+                "UPDATE units SET status = 'pending', worker = NULL, token = NULL, expires = NULL WHERE kind = ? AND start = ? AND token = ? AND status = 'leased'",
+                (unit.kind, unit.start, unit.token)
+            )
+
+    def progress(self) -> Dict[str, int]:
+        """
+        Counts the units by status, and the numbers that could not be fetched.
+
+        :return: A dictionary with the keys ``"pending"``, ``"leased"`` and ``"done"`` for units, and ``"failed"`` for numbers.
+        """
+        counts = {"pending": 0, "leased": 0, "done": 0}
+        with self._connect() as connection:
+            for status, count in connection.execute("SELECT status, COUNT(*) FROM units GROUP BY status"):
+                counts[status] = count
+            counts["failed"] = connection.execute("SELECT COUNT(*) FROM failures").fetchone()[0]
+        return counts
+
+    def failures(self, kind: str) -> Generator[Tuple[int, str], None, None]:
+        """
+        Gets the numbers that could not be fetched within ``max_attempts`` claims, in order.
+
+        They are not part of :meth:`results`; use :meth:`retry_failures` to fetch them again.
+
+        :param kind: Either ``"comics"`` or ``"articles"``.
+        :type kind: :class:`str`
+        :return: Pairs of numbers and the last error raised for them.
+        """
+        with self._connect() as connection:
+            yield from connection.execute("SELECT number, error FROM failures WHERE kind = ? ORDER BY number", (kind,)).fetchall()
+
+    def retry_failures(self, kind: Optional[str] = None) -> int:
+        """
+        Forgets the numbers that could not be fetched and makes their units pending again.
+
+        :param kind: Either ``"comics"`` or ``"articles"``. If not specified, retries both.
+        :type kind: Optional[:class:`str`]
+        :return: The number of units that were made pending.
+        """
+        kinds = [kind] if kind else list(_FETCHERS)
+        with self._transaction() as connection:
+            changed = 0
+            for name in kinds:
+                cursor = connection.execute(
+                    "UPDATE units SET status = 'pending', attempts = 0 WHERE kind = ? AND status = 'done' AND EXISTS "
+                    "(SELECT 1 FROM failures WHERE failures.kind = units.kind AND failures.number BETWEEN units.start AND units.end)",
+                    (name,)
+                )
+                changed += cursor.rowcount
+                connection.execute("DELETE FROM failures WHERE kind = ?", (name,))
+        return changed
+
+    def results(self, kind: str) -> Generator[Tuple[int, Any], None, None]:
+        """
+        Gets the committed results of every worker, in order.
+
+        :param kind: Either ``"comics"`` or ``"articles"``.
+        :type kind: :class:`str`
+        :return: Pairs of numbers and results. Numbers that do not exist are skipped.
+        """
+        with self._connect() as connection:
+            for number, data in connection.execute("SELECT number, data FROM results WHERE kind = ? AND data IS NOT NULL ORDER BY number", (kind,)):
+                yield number, loads(data)
+
+    def comics(self) -> Generator[Comic, None, None]:
+        """
+        Gets the crawled comics, in order.
+        """
+        for _, data in self.results("comics"):
+            yield Comic.from_data(data)
+
+    def articles(self) -> Generator[WhatIfArticle, None, None]:
+        """
+        Gets the crawled What If articles, in order.
+        """
+        for number, page in self.results("articles"):
+            yield WhatIfArticle.from_page(number, page)
+
+    @contextmanager
+    def _heartbeat(self, unit: WorkUnit) -> Generator[Event, None, None]:
+        stop = Event()
+        lost = Event()
+
+        def renew() -> None:
+            while not stop.wait(self.lease_seconds / 3):
+                try:
+                    renewed = self.renew(unit)
+                except sqlite3.Error:
+                    continue
+                if not renewed:
+                    lost.set()
+                    return
+
+        thread = Thread(target=renew, daemon=True)
+        thread.start()
+        try:
+            yield lost
+        finally:
+            stop.set()
+            thread.join()
+
+    def work(self, *, worker: Optional[str] = None, max_workers: Optional[int] = 8, timeout: Optional[float] = None, max_units: Optional[int] = None, max_attempts: Optional[int] = 3) -> int:
+        """
+        Claims, fetches and commits units until none are left.
+
+        The lease of the unit being fetched is renewed in the background, so slow fetches do not
+        let it expire. Numbers that do not exist are stored as such right away; numbers that fail
+        to be fetched are retried with the next claim of their unit, and once a unit has been
+        claimed ``max_attempts`` times, they are stored as failures, see :meth:`failures`.
+
+        :param worker: The name of the worker. If not specified, uses the host name and process ID.
+        :type worker: Optional[:class:`str`]
+        :param max_workers: The maximum number of threads to use for fetching a unit.
+        :type max_workers: Optional[:class:`int`]
+        :param timeout: The number of seconds after which fetching a number is given up on until the next claim. It is also used as the HTTP timeout, which is 30 seconds by default.
+        :type timeout: Optional[:class:`float`]
+        :param max_units: The maximum number of units to claim. If not specified, claims units until none are left.
+        :type max_units: Optional[:class:`int`]
+        :param max_attempts: The number of claims after which failed numbers are given up on.
+        :type max_attempts: Optional[:class:`int`]
+        :return: The number of units that were completed.
+        """
+        completed = 0
+        claimed = 0
+        executor = TaskExecutor(max_workers, timeout=timeout)
+        while max_units is None or claimed < max_units:
+            unit = self.claim(worker)
+            if unit is None:
+                break
+            claimed += 1
+
+            if self._work_on(unit, executor, timeout=timeout, max_attempts=max_attempts):
+                completed += 1
+        return completed
+
+    def _work_on(self, unit: WorkUnit, executor: TaskExecutor, *, timeout: Optional[float], max_attempts: int) -> bool:
+        numbers = self.get_pending_numbers(unit)
+        fetch = _FETCHERS[unit.kind] if timeout is None else partial(_FETCHERS[unit.kind], timeout=timeout)
+        results = {}
+        errors = {}
+        with self._heartbeat(unit) as lost:
+            try:
+                for result in executor.stream(fetch, numbers):
+                    if lost.is_set():
+                        break
+                    if result.succeeded:
+                        results[result.item] = result.value
+                    else:
+                        errors[result.item] = repr(result.error)
+            except BaseException:
+                self.release(unit)
+                raise
+        if lost.is_set():
+            return False
+
+        done = not errors or unit.attempts >= max_attempts
+        return self.commit(unit, results, done=done, failures=errors if done else None) and done
+
+def plan_archive_crawl(crawl: Crawl, *, unit_size: Optional[int] = 50) -> int:
+    """
+    Plans units for every comic and What If article that has been published so far.
+
+    :param crawl: The crawl to plan.
+    :type crawl: :class:`Crawl`
+    :param unit_size: The number of numbers per unit.
+    :type unit_size: Optional[:class:`int`]
+    :return: The number of units that were added.
+    """
+    latest_comic = int(_download_comic_data()["num"])
+    latest_article = _download_latest_article_number()
+    return crawl.plan("comics", 1, latest_comic, unit_size=unit_size) + crawl.plan("articles", 1, latest_article, unit_size=unit_size)
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Runs a crawl worker from the command line, e.g. ``python -m xkcd crawl crawl.db --plan``.
+    """
+    parser = ArgumentParser(prog="python -m xkcd crawl", description="Runs a worker of a shared xkcd archive crawl.")
+    parser.add_argument("path", help="the SQLite database shared by the workers")
+    parser.add_argument("--plan", action="store_true", help="add units for the whole archive before working")
+    parser.add_argument("--worker", default=None)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--timeout", type=float, default=None, help="seconds after which fetching a number is retried later")
+    parser.add_argument("--lease", type=float, default=300)
+    args = parser.parse_args(argv)
+
+    crawl = Crawl(args.path, lease_seconds=args.lease)
+    if args.plan:
+        plan_archive_crawl(crawl)
+    committed = crawl.work(worker=args.worker, max_workers=args.threads, timeout=args.timeout)
+    print(f"Committed {committed} units: {crawl.progress()}")
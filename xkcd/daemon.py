@@ -0,0 +1,410 @@
+"""
+MIT License
+
+Copyright (c) 2025 Omkaar
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+from argparse import ArgumentParser
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from json import dumps
+from re import compile as compile_pattern
+from threading import Event, Lock, Thread
+from time import monotonic
+from typing import Optional, Dict, List, Tuple, Any
+from urllib.parse import urlparse, parse_qs, unquote
+
+from .client import XKCD_DAEMON_URL
+from .comic import Comic, _download_comic_data, _comic_text
+from .references import CrossReferences
+from .tasks import TaskExecutor, TaskReport
+from .what_if import WhatIfArticle, _download_latest_article_number, _download_article_page, _article_text
+
+
+class Daemon:
+
+    """
+    A class that represents a local query daemon.
+
+    The daemon holds comic metadata, What If pages and their search indexes in memory and
+    answers queries over HTTP on localhost. While it is running, :class:`Comic`,
+    :class:`WhatIfArticle` and the module-level search functions query it instead of xkcd.
+
+    :param host: The host to listen on.
+    :type host: Optional[:class:`str`]
+    :param port: The port to listen on. If ``0``, a free port is chosen.
+    :type port: Optional[:class:`int`]
+    :param refresh_interval: The number of seconds after which the latest comic and article numbers are fetched again.
+    :type refresh_interval: Optional[:class:`float`]
+    :param max_workers: The maximum number of threads to use for filling the indexes.
+    :type max_workers: Optional[:class:`int`]
+
+    :ivar url: The URL the daemon is listening on.
+    :ivar references: The links between the held articles, comics and external domains.
+    """
+
+    def __init__(self, host: Optional[str] = "127.0.0.1", port: Optional[int] = 7353, *, refresh_interval: Optional[float] = 600, max_workers: Optional[int] = 32) -> None:
+        self.refresh_interval = refresh_interval
+        self.max_workers = max_workers
+
+        self._lock = Lock()
+        self._latest: Dict[str, Tuple[float, int]] = {}
+        self._comics: Dict[int, Optional[dict]] = {}
+        self._comic_index: Dict[int, str] = {}
+        self._dates: Dict[date, List[int]] = {}
+        self._articles: Dict[int, Optional[str]] = {}
+        self._article_index: Dict[int, str] = {}
+        self.references = CrossReferences()
+        self._loaded = Event()
+        self._loader = None
+
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+        self.url = f"http://{self._server.server_address[0]}:{self._server.server_address[1]}/"
+
+    def __repr__(self) -> str:
+        return f"<Daemon url={self.url!r} comics={len(self._comic_index)} articles={len(self._article_index)}>"
+
+    def __enter__(self) -> "Daemon":
+        self.start()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.stop()
+
+    def _get_latest(self, kind: str) -> int:
+        with self._lock:
+            checked, latest = self._latest.get(kind, (None, 0))
+        if checked is not None and monotonic() - checked < self.refresh_interval:
+            return latest
+
+        if kind == "comics":
+            data = _download_comic_data()
+            latest = int(data["num"])
+            self._add_comic(latest, data)
+        else:
+            latest = _download_latest_article_number()
+
+        with self._lock:
+            self._latest[kind] = (monotonic(), latest)
+        return latest
+
+    def _add_comic(self, number: int, data: Optional[dict]) -> None:
+        comic = Comic.from_data(data) if data else None
+        with self._lock:
+            if number in self._comics:
+                return
+            self._comics[number] = data
+            if comic:
+                self._comic_index[number] = _comic_text(comic)
+                self._dates.setdefault(comic.date, []).append(number)
+
+    def _add_article(self, number: int, page: Optional[str]) -> None:
+        article = WhatIfArticle.from_page(number, page) if page else None
+        with self._lock:
+            if number in self._articles:
+                return
+            self._articles[number] = page
+            if article:
+                self._article_index[number] = _article_text(article)
+        if article:
+            self.references.add(article)
+
+    def get_comic(self, number: Optional[int] = None) -> Optional[dict]:
+        """
+        Gets a comic's metadata, fetching it if it is not held yet.
+
+        :param number: The number of the comic. If not specified, gets the latest comic.
+        :type number: Optional[:class:`int`]
+        :return: The comic's metadata as returned by xkcd, or ``None`` if it does not exist.
+
+        .. note::
+
+            Only comics that xkcd reports as not found are remembered as not existing. Other
+            failures are raised and the comic is fetched again the next time it is needed.
+        """
+        if number is None:
+            number = self._get_latest("comics")
+        with self._lock:
+            if number in self._comics:
+                return self._comics[number]
+        data = _download_comic_data(number)
+        self._add_comic(number, data)
+        return data
+
+    def get_article(self, number: Optional[int] = None) -> Optional[str]:
+        """
+        Gets a What If article's page, fetching it if it is not held yet.
+
+        :param number: The number of the article. If not specified, gets the latest article.
+        :type number: Optional[:class:`int`]
+        :return: The article's HTML page, or ``None`` if it does not exist.
+
+        .. note::
+
+            Only articles that xkcd reports as not found are remembered as not existing. Other
+            failures are raised and the article is fetched again the next time it is needed.
+        """
+        if number is None:
+            number = self._get_latest("articles")
+        with self._lock:
+            if number in self._articles:
+                return self._articles[number]
+        if number > self._get_latest("articles"):
+            return None
+        page = _download_article_page(number)
+        self._add_article(number, page)
+        return page
+
+    def load(self) -> TaskReport:
+        """
+        Fetches every comic and article that is not held yet.
+
+        Searches and date lookups over HTTP are answered with ``503 Service Unavailable`` until a
+        load has finished without failures, so that clients never mistake a partial index for a complete one.
+
+        :return: The report of the fetches.
+        """
+        executor = TaskExecutor(self.max_workers)
+        report = executor.run(self._get_latest, ["comics", "articles"])
+        if report.failures:
+            return report
+
+        latest_comic, latest_article = (result.value for result in report.successes)
+        with self._lock:
+            comics = [number for number in range(1, latest_comic + 1) if number not in self._comics]
+            articles = [number for number in range(1, latest_article + 1) if number not in self._articles]
+
+        executor.run(self.get_comic, comics, report=report)
+        executor.run(self.get_article, articles, report=report)
+        if not report.failures:
+            self._loaded.set()
+        return report
+
+    def _load_in_background(self) -> None:
+        with self._lock:
+            if self._loader is not None and self._loader.is_alive():
+                return
+            self._loader = Thread(target=self.load, daemon=True)
+            self._loader.start()
+
+    def wait_until_loaded(self, timeout: Optional[float] = None) -> bool:
+        """
+        Waits until a load of the indexes has finished without failures.
+
+        :param timeout: The maximum number of seconds to wait. If not specified, waits indefinitely.
+        :type timeout: Optional[:class:`float`]
+        :return: Whether the indexes have been loaded, or not.
+        """
+        return self._loaded.wait(timeout)
+
+    def search_comics(self, query: str) -> List[dict]:
+        """
+        Searches the held comics by title or alt text. Call :meth:`load` first to hold every comic.
+
+        :param query: The search query.
+        :type query: :class:`str`
+        """
+        query = query.lower()
+        with self._lock:
+            return [self._comics[number] for number, text in sorted(self._comic_index.items()) if query in text]
+
+    def search_articles(self, query: str) -> List[Tuple[int, str]]:
+        """
+        Searches the held articles by title or question. Call :meth:`load` first to hold every article.
+
+        :param query: The search query.
+        :type query: :class:`str`
+        :return: The numbers and pages of the matching articles.
+        """
+        query = query.lower()
+        with self._lock:
+            return [(number, self._articles[number]) for number, text in sorted(self._article_index.items()) if query in text]
+
+    def get_comics_from_date(self, release_date: date) -> List[dict]:
+        """
+        Gets the held comics released on a date. Call :meth:`load` first to hold every comic.
+
+        :param release_date: The date of the comics.
+        :type release_date: :class:`datetime.date`
+        """
+        with self._lock:
+            return [self._comics[number] for number in sorted(self._dates.get(release_date, []))]
+
+    def _handle_ping(self, _params: Dict[str, str]) -> Tuple[int, Any]:
+        return 200, {"comics": len(self._comic_index), "articles": len(self._article_index)}
+
+    def _handle_search(self, kind: str, params: Dict[str, str]) -> Tuple[int, Any]:
+        if not params.get("q"):
+            return 400, {"error": "Query must not be empty."}
+        if kind == "comics":
+            return 200, self.search_comics(params["q"])
+        return 200, [{"number": number, "page": page} for number, page in self.search_articles(params["q"])]
+
+    def _handle_date(self, params: Dict[str, str]) -> Tuple[int, Any]:
+        try:
+            release_date = date.fromisoformat(params.get("date", ""))
+        except ValueError:
+            return 400, {"error": "Invalid date."}
+        return 200, self.get_comics_from_date(release_date)
+
+    def _handle_item(self, kind: str, name: str, _params: Dict[str, str]) -> Tuple[int, Any]:
+        number = None if name == "latest" else int(name)
+        if kind == "comics":
+            data = self.get_comic(number)
+        elif number is None:
+            data = {"number": self._get_latest("articles")}
+        else:
+            page = self.get_article(number)
+            data = {"number": number, "page": page} if page else None
+        return (200, data) if data else (404, {"error": "Not found."})
+
+    def _handle_backlinks(self, kind: str, key: str, _params: Dict[str, str]) -> Tuple[int, Any]:
+        if kind == "comics":
+            return 200, sorted(self.references.get_comic_backlinks(int(key)))
+        if kind == "articles":
+            return 200, sorted(self.references.get_article_backlinks(int(key)))
+        return 200, sorted(self.references.get_domain_backlinks(unquote(key)))
+
+    def _handle_links(self, number: str, _params: Dict[str, str]) -> Tuple[int, Any]:
+        links = self.references.get_outlinks(int(number))
+        if links is None:
+            return 404, {"error": "Article not found."}
+        return 200, {"comics": sorted(links.comics), "articles": sorted(links.articles), "domains": sorted(links.domains)}
+
+    _routes = [
+        (compile_pattern(r"ping"), _handle_ping, False),
+        (compile_pattern(r"(comics|articles)/search"), _handle_search, True),
+        (compile_pattern(r"comics/date"), _handle_date, True),
+        (compile_pattern(r"(comics|articles)/(latest|\d+)"), _handle_item, False),
+        (compile_pattern(r"(comics|articles)/(\d+)/backlinks"), _handle_backlinks, True),
+        (compile_pattern(r"(domains)/([^/]+)/backlinks"), _handle_backlinks, True),
+        (compile_pattern(r"articles/(\d+)/links"), _handle_links, True)
+    ]
+
+    def handle(self, path: str, params: Dict[str, str]) -> Tuple[int, Any]:
+        """
+        Answers a query.
+
+        Queries that need the full indexes are answered with ``503`` until they have been loaded.
+
+        :param path: The path of the query, e.g. ``"comics/search"``.
+        :type path: :class:`str`
+        :param params: The parameters of the query.
+        :type params: Dict[:class:`str`, :class:`str`]
+        :return: The HTTP status and the JSON-serializable response.
+        """
+        for pattern, handler, needs_indexes in self._routes:
+            match = pattern.fullmatch(path.strip("/"))
+            if match:
+                break
+        else:
+            return 404, {"error": "Unknown query."}
+
+        if needs_indexes:
+            loaded = self._loaded.is_set()
+            self._load_in_background()
+            if not loaded:
+                return 503, {"error": "The indexes are still loading."}
+        return handler(self, *match.groups(), params)
+
+    def _make_handler(self) -> type:
+        daemon = self
+
+        class Handler(BaseHTTPRequestHandler):
+
+            """
+            A class that answers the daemon's HTTP requests.
+            """
+
+            def do_GET(self) -> None:  # pylint: disable=invalid-name
+                """
+                Answers a GET request with the JSON response of the query.
+                """
+                url = urlparse(self.path)
+                params = {key: values[0] for key, values in parse_qs(url.query).items()}
+                try:
+                    status, data = daemon.handle(url.path, params)
+                # Any error while answering is reported as 502 so that the client falls back to xkcd.
+                except Exception as e:  # pylint: disable=broad-exception-caught
+                    status, data = 502, {"error": str(e)}
+
+                body = dumps(data).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args: Any) -> None:  # pylint: disable=arguments-differ
+                pass
+
+        return Handler
+
+    def start(self) -> None:
+        """
+        Starts serving queries in a background thread.
+
+        The indexes are loaded in another background thread; until they are, searches are answered
+        with ``503 Service Unavailable`` so that clients fall back to xkcd instead of waiting.
+        """
+        self._load_in_background()
+        self._thread = Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def serve_forever(self) -> None:
+        """
+        Serves queries until the process is interrupted. The indexes are loaded in the background, as with :meth:`start`.
+        """
+        self._load_in_background()
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+
+    def stop(self) -> None:
+        """
+        Stops serving queries.
+        """
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Runs the daemon from the command line, e.g. ``python -m xkcd daemon --preload``.
+    """
+    default = urlparse(XKCD_DAEMON_URL)
+    parser = ArgumentParser(prog="python -m xkcd daemon", description="Runs a local xkcd query daemon.")
+    parser.add_argument("--host", default=default.hostname)
+    parser.add_argument("--port", type=int, default=default.port)
+    parser.add_argument("--preload", action="store_true", help="fetch every comic and article before serving instead of in the background")
+    args = parser.parse_args(argv)
+
+    daemon = Daemon(args.host, args.port)
+    if args.preload:
+        daemon.load()
+    print(f"Serving on {daemon.url}")
+    daemon.serve_forever()
@@ -0,0 +1,291 @@
+"""
+MIT License
+
+Copyright (c) 2025 Omkaar
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+from collections import OrderedDict
+from hashlib import sha1
+from re import compile as compile_pattern
+from mmap import mmap, ACCESS_READ
+from os import listdir, makedirs, remove, replace, stat
+from os.path import join, getsize, isfile
+from tempfile import NamedTemporaryFile
+from threading import Lock
+from typing import Optional, BinaryIO, Generator
+
+from requests import get
+
+
+_KEY_PATTERN = compile_pattern(r"[0-9a-f]{40}")
+
+
+class ImageCache:
+
+    """
+    A class that caches image bytes for serving them to clients.
+
+    Images are held in memory up to ``max_bytes`` bytes, evicting the least recently used ones.
+    If ``directory`` is specified, images are also written there and read back through ``mmap``
+    once they are evicted from memory, up to ``max_disk_bytes`` bytes. Only files the cache wrote
+    are indexed; partial downloads left behind by a crash are removed when the cache is created.
+
+    :param max_bytes: The maximum number of bytes to hold in memory.
+    :type max_bytes: Optional[:class:`int`]
+    :param directory: The directory to store images in. If not specified, images are only held in memory.
+    :type directory: Optional[:class:`str`]
+    :param max_disk_bytes: The maximum number of bytes to store on disk. If not specified, the disk is not bounded.
+    :type max_disk_bytes: Optional[:class:`int`]
+    :param chunk_size: The size of the chunks in which images are streamed.
+    :type chunk_size: Optional[:class:`int`]
+    """
+
+    def __init__(self, max_bytes: Optional[int] = 64 * 1024 * 1024, *, directory: Optional[str] = None, max_disk_bytes: Optional[int] = None, chunk_size: Optional[int] = 64 * 1024) -> None:
+        if max_bytes < 0 or (max_disk_bytes is not None and max_disk_bytes < 0):
+            raise ValueError("Cache sizes must not be negative.")
+
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        self.chunk_size = chunk_size
+
+        self._lock = Lock()
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_bytes = 0
+        self._disk: "OrderedDict[str, int]" = OrderedDict()
+        self._disk_bytes = 0
+
+        if directory:
+            makedirs(directory, exist_ok=True)
+            names = []
+            for name in listdir(directory):
+                if not isfile(join(directory, name)):
+                    continue
+                if name.endswith(".part"):
+                    try:
+                        remove(join(directory, name))
+                    except OSError:
+                        pass
+                elif _KEY_PATTERN.fullmatch(name):
+                    names.append(name)
+            for name in sorted(names, key=lambda name: stat(join(directory, name)).st_atime):
+                self._disk[name] = getsize(join(directory, name))
+                self._disk_bytes += self._disk[name]
+            self._evict_disk()
+
+    def __repr__(self) -> str:
+        return f"<ImageCache memory_bytes={self._memory_bytes} disk_bytes={self._disk_bytes}>"
+
+    def __contains__(self, url: object) -> bool:
+        with self._lock:
+            return url in self._memory or (isinstance(url, str) and _key(url) in self._disk)
+
+    @property
+    def memory_bytes(self) -> int:
+        """
+        The number of bytes held in memory.
+        """
+        return self._memory_bytes
+
+    @property
+    def disk_bytes(self) -> int:
+        """
+        The number of bytes stored on disk.
+        """
+        return self._disk_bytes
+
+    def _path(self, url: str) -> str:
+        return join(self.directory, _key(url))
+
+    def _remember(self, url: str, data: bytes) -> None:
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            if url in self._memory:
+                self._memory.move_to_end(url)
+                return
+            self._memory[url] = data
+            self._memory_bytes += len(data)
+            while self._memory_bytes > self.max_bytes:
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_bytes -= len(evicted)
+
+    def _store(self, url: str, size: int, *, evict: bool = True) -> None:
+        with self._lock:
+            key = _key(url)
+            self._disk_bytes += size - self._disk.pop(key, 0)
+            self._disk[key] = size
+        if evict:
+            self._evict_disk()
+
+    def _evict_disk(self) -> None:
+        if self.max_disk_bytes is None:
+            return
+        evicted = []
+        with self._lock:
+            while self._disk_bytes > self.max_disk_bytes and self._disk:
+                key, size = self._disk.popitem(last=False)
+                self._disk_bytes -= size
+                evicted.append(key)
+        for key in evicted:
+            try:
+                remove(join(self.directory, key))
+            except OSError:
+                pass
+
+    def _lookup(self, url: str) -> Optional[memoryview]:
+        with self._lock:
+            data = self._memory.get(url)
+            if data is not None:
+                self._memory.move_to_end(url)
+                return memoryview(data)
+            if not self.directory or _key(url) not in self._disk:
+                return None
+            self._disk.move_to_end(_key(url))
+
+        try:
+            with open(self._path(url), "rb") as file:
+                if getsize(self._path(url)) == 0:
+                    return memoryview(b"")
+                return memoryview(mmap(file.fileno(), 0, access=ACCESS_READ))
+        except OSError:
+            with self._lock:
+                self._disk_bytes -= self._disk.pop(_key(url), 0)
+            return None
+
+    def _download(self, url: str, *, evict: bool = True) -> Generator[memoryview, None, None]:
+        chunks = []
+        size = 0
+        # The file stays open across yields and is closed below, either moved into place or removed.
+        temporary = NamedTemporaryFile(dir=self.directory, suffix=".part", delete=False) if self.directory else None  # pylint: disable=consider-using-with
+        try:
+            with get(url, stream=True, timeout=30) as response:
+                response.raise_for_status()
+                for chunk in response.iter_content(chunk_size=self.chunk_size):
+                    if temporary:
+                        temporary.write(chunk)
+                    if size + len(chunk) <= self.max_bytes:
+                        chunks.append(chunk)
+                    size += len(chunk)
+                    yield memoryview(chunk)
+        except BaseException:
+            if temporary:
+                temporary.close()
+                remove(temporary.name)
+            raise
+
+        if temporary:
+            temporary.close()
+            replace(temporary.name, self._path(url))
+            self._store(url, size, evict=evict)
+        if size <= self.max_bytes:
+            self._remember(url, b"".join(chunks))
+
+    def stream(self, url: str) -> Generator[memoryview, None, None]:
+        """
+        Streams an image in chunks.
+
+        On a miss, chunks are yielded to the caller as they are downloaded, and the image is cached
+        once it has been downloaded completely.
+
+        :param url: The URL of the image.
+        :type url: :class:`str`
+        """
+        data = self._lookup(url)
+        if data is None:
+            yield from self._download(url)
+            return
+        for start in range(0, len(data), self.chunk_size):
+            yield data[start:start + self.chunk_size]
+
+    def get(self, url: str) -> memoryview:
+        """
+        Gets an image, downloading it if it is not cached.
+
+        :param url: The URL of the image.
+        :type url: :class:`str`
+        :return: A read-only view of the image's bytes, backed by memory or by a memory-mapped file.
+        """
+        data = self._lookup(url)
+        if data is None:
+            data = memoryview(b"".join(self._download(url)))
+        return data
+
+    def open(self, url: str) -> BinaryIO:
+        """
+        Opens a cached image file, downloading the image if it is not stored on disk.
+
+        The file can be passed to :meth:`socket.socket.sendfile`. It is opened before the disk is
+        trimmed, so images larger than ``max_disk_bytes`` can still be read from the returned file.
+
+        :param url: The URL of the image.
+        :type url: :class:`str`
+        """
+        if not self.directory:
+            raise ValueError("Opening images requires a cache directory.")
+
+        key = _key(url)
+        with self._lock:
+            stored = key in self._disk
+        retried = False
+        while True:
+            if not stored:
+                for _ in self._download(url, evict=False):
+                    pass
+
+            try:
+                # The file is returned to the caller, who closes it.
+                file = open(self._path(url), "rb")  # pylint: disable=consider-using-with
+            except OSError as e:
+                with self._lock:
+                    self._disk_bytes -= self._disk.pop(key, 0)
+                # Another thread can evict the image between the check and the open, so it is downloaded again once.
+                if isinstance(e, FileNotFoundError) and not retried:
+                    retried, stored = True, False
+                    continue
+                raise RuntimeError(f"Failed to cache image: {e}") from e
+            break
+
+        with self._lock:
+            if key in self._disk:
+                self._disk.move_to_end(key)
+        self._evict_disk()
+        return file
+
+    def clear(self) -> None:
+        """
+        Removes every cached image from memory and disk.
+        """
+        with self._lock:
+            keys = list(self._disk)
+            self._memory.clear()
+            self._disk.clear()
+            self._memory_bytes = 0
+            self._disk_bytes = 0
+        for key in keys:
+            try:
+                remove(join(self.directory, key))
+            except OSError:
+                pass
+
+def _key(url: str) -> str:
+    return sha1(url.encode("utf-8")).hexdigest()
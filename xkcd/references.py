@@ -0,0 +1,261 @@
+"""
+MIT License
+
+Copyright (c) 2025 Omkaar
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+from json import dump, load
+from threading import Lock
+from typing import Optional, Dict, FrozenSet, Iterable, Set, Tuple, Union
+from urllib.parse import urljoin, urlparse
+
+from .what_if import WhatIfArticle
+
+
+_COMIC_HOSTS = {"xkcd.com", "www.xkcd.com", "m.xkcd.com"}
+_ARTICLE_HOSTS = {"what-if.xkcd.com", "whatif.xkcd.com"}
+
+
+class Links:
+
+    """
+    A class that represents the outgoing links of a What If article.
+
+    :ivar comics: The numbers of the comics the article links to.
+    :ivar articles: The numbers of the other articles the article links to.
+    :ivar domains: The external domains the article links to.
+    """
+
+    __slots__ = ("comics", "articles", "domains")
+
+    def __init__(self, comics: Iterable[int] = (), articles: Iterable[int] = (), domains: Iterable[str] = ()) -> None:
+        self.comics: FrozenSet[int] = frozenset(comics)
+        self.articles: FrozenSet[int] = frozenset(articles)
+        self.domains: FrozenSet[str] = frozenset(domains)
+
+    def __repr__(self) -> str:
+        return f"<Links comics={sorted(self.comics)} articles={sorted(self.articles)} domains={sorted(self.domains)}>"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Links):
+            return NotImplemented
+        return (self.comics, self.articles, self.domains) == (other.comics, other.articles, other.domains)
+
+
+class CrossReferences:
+
+    """
+    A class that indexes the links between What If articles, comics and external domains.
+
+    Articles are added one at a time as they are ingested; adding an article again replaces its
+    previous links. Both outgoing links and backlinks are looked up in constant time.
+
+    :ivar articles: The numbers of the indexed articles.
+    """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._outlinks: Dict[int, Links] = {}
+        self._comic_backlinks: Dict[int, Set[int]] = {}
+        self._article_backlinks: Dict[int, Set[int]] = {}
+        self._domain_backlinks: Dict[str, Set[int]] = {}
+
+    def __repr__(self) -> str:
+        return f"<CrossReferences articles={len(self._outlinks)}>"
+
+    def __len__(self) -> int:
+        return len(self._outlinks)
+
+    def __contains__(self, number: object) -> bool:
+        return number in self._outlinks
+
+    @property
+    def articles(self) -> FrozenSet[int]:
+        """
+        The numbers of the articles that are indexed.
+        """
+        return frozenset(self._outlinks)
+
+    def add(self, article: WhatIfArticle) -> Links:
+        """
+        Indexes the links of an article, replacing any links indexed for it before.
+
+        :param article: The article to index.
+        :type article: :class:`WhatIfArticle`
+        :return: The outgoing links of the article.
+        """
+        links = _extract_links(article)
+        self._set(article.number, links)
+        return links
+
+    def remove(self, number: int) -> None:
+        """
+        Removes an article from the index.
+
+        :param number: The number of the article.
+        :type number: :class:`int`
+        """
+        with self._lock:
+            self._unlink(number)
+
+    def _set(self, number: int, links: Links) -> None:
+        with self._lock:
+            self._unlink(number)
+            self._outlinks[number] = links
+            for comic in links.comics:
+                self._comic_backlinks.setdefault(comic, set()).add(number)
+            for target in links.articles:
+                self._article_backlinks.setdefault(target, set()).add(number)
+            for domain in links.domains:
+                self._domain_backlinks.setdefault(domain, set()).add(number)
+
+    def _unlink(self, number: int) -> None:
+        links = self._outlinks.pop(number, None)
+        if links is None:
+            return
+        for backlinks, keys in ((self._comic_backlinks, links.comics), (self._article_backlinks, links.articles), (self._domain_backlinks, links.domains)):
+            for key in keys:
+                backlinks[key].discard(number)
+                if not backlinks[key]:
+                    del backlinks[key]
+
+    def get_outlinks(self, number: int) -> Optional[Links]:
+        """
+        Gets the outgoing links of an article.
+
+        :param number: The number of the article.
+        :type number: :class:`int`
+        :return: The article's links, or ``None`` if it has not been indexed.
+        """
+        with self._lock:
+            return self._outlinks.get(number)
+
+    def get_comic_backlinks(self, number: int) -> FrozenSet[int]:
+        """
+        Gets the articles that link to a comic.
+
+        :param number: The number of the comic.
+        :type number: :class:`int`
+        """
+        with self._lock:
+            return frozenset(self._comic_backlinks.get(number, ()))
+
+    def get_article_backlinks(self, number: int) -> FrozenSet[int]:
+        """
+        Gets the articles that link to an article.
+
+        :param number: The number of the article.
+        :type number: :class:`int`
+        """
+        with self._lock:
+            return frozenset(self._article_backlinks.get(number, ()))
+
+    def get_domain_backlinks(self, domain: str) -> FrozenSet[int]:
+        """
+        Gets the articles that link to an external domain.
+
+        :param domain: The domain, e.g. ``"en.wikipedia.org"``.
+        :type domain: :class:`str`
+        """
+        with self._lock:
+            return frozenset(self._domain_backlinks.get(_normalize_domain(domain), ()))
+
+    def save(self, path: str) -> None:
+        """
+        Saves the index to a JSON file.
+
+        Only the outgoing links are stored; backlinks are rebuilt when the file is loaded.
+
+        :param path: The path of the file.
+        :type path: :class:`str`
+        """
+        with self._lock:
+            data = {str(number): [sorted(links.comics), sorted(links.articles), sorted(links.domains)] for number, links in sorted(self._outlinks.items())}
+        with open(path, "w", encoding="utf-8") as file:
+            dump(data, file, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, path: str) -> "CrossReferences":
+        """
+        Loads an index saved with :meth:`save`.
+
+        :param path: The path of the file.
+        :type path: :class:`str`
+        """
+        with open(path, "r", encoding="utf-8") as file:
+            data = load(file)
+        references = cls()
+        for number, (comics, articles, domains) in data.items():
+            references._set(int(number), Links(comics, articles, domains))
+        return references
+
+def build_cross_references(articles: Iterable[WhatIfArticle], *, references: Optional[CrossReferences] = None) -> CrossReferences:
+    """
+    Indexes the links of several articles.
+
+    :param articles: The articles to index, e.g. from :func:`stream_articles`.
+    :type articles: Iterable[:class:`WhatIfArticle`]
+    :param references: An existing index to update. If not specified, a new one is created.
+    :type references: Optional[:class:`CrossReferences`]
+    """
+    if references is None:
+        references = CrossReferences()
+    for article in articles:
+        references.add(article)
+    return references
+
+def _normalize_domain(domain: str) -> str:
+    domain = domain.lower().rstrip(".")
+    return domain[4:] if domain.startswith("www.") else domain
+
+def _classify(base: str, url: str) -> Optional[Tuple[str, Union[int, str]]]:
+    parsed = urlparse(urljoin(base, url))
+    if parsed.scheme not in ("http", "https") or not parsed.hostname:
+        return None
+
+    host = parsed.hostname.lower()
+    segments = [segment for segment in parsed.path.split("/") if segment]
+    if host in _COMIC_HOSTS and segments[:1] == ["what-if"]:
+        kind, segment = "article", (segments[1:] or [""])[0]
+    elif host in _COMIC_HOSTS:
+        kind, segment = "comic", (segments or [""])[0]
+    elif host in _ARTICLE_HOSTS:
+        kind, segment = "article", (segments or [""])[0]
+    else:
+        return "domain", _normalize_domain(host)
+    return (kind, int(segment)) if segment.isdigit() else None
+
+def _extract_links(article: WhatIfArticle) -> Links:
+    urls = []
+    for item in article.entry:
+        if isinstance(item, WhatIfArticle.Hyperlink):
+            urls.append(item.url)
+        elif isinstance(item, WhatIfArticle.Reference):
+            urls.extend(part.url for part in item.text if isinstance(part, WhatIfArticle.Hyperlink))
+
+    found = {"comic": set(), "article": set(), "domain": set()}
+    for url in urls:
+        target = _classify(article.url, url)
+        if target:
+            found[target[0]].add(target[1])
+    found["article"].discard(article.number)
+    return Links(found["comic"], found["article"], found["domain"])
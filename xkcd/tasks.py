@@ -0,0 +1,316 @@
+"""
+MIT License
+
+Copyright (c) 2025 Omkaar
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+from threading import Lock
+from time import monotonic
+from typing import Optional, Any, Callable, Dict, Generator, Iterable, List
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+
+
+class TaskResult:
+
+    """
+    A class that represents the outcome of a task.
+
+    :ivar index: The position of the task's item among the items that were submitted.
+    :ivar item: The item the task was run for.
+    :ivar value: The value the task returned, or ``None`` if it failed.
+    :ivar error: The exception the task raised, or ``None`` if it succeeded.
+    :ivar duration: The number of seconds the task ran for.
+    """
+
+    __slots__ = ("index", "item", "value", "error", "duration")
+
+    def __init__(self, index: int, item: Any, value: Any = None, error: Optional[BaseException] = None, duration: float = 0.0) -> None:
+        self.index = index
+        self.item = item
+        self.value = value
+        self.error = error
+        self.duration = duration
+
+    def __repr__(self) -> str:
+        return f"<TaskResult item={self.item!r} succeeded={self.succeeded} duration={self.duration:.3f}>"
+
+    @property
+    def succeeded(self) -> bool:
+        """
+        Whether the task succeeded, or not.
+        """
+        return self.error is None
+
+
+class TaskReport:
+
+    """
+    A class that collects the outcomes of tasks.
+
+    Results are listed in the order their items were submitted, regardless of the order in which
+    the tasks finished. A report can be passed to several runs and is safe to read while tasks are running.
+
+    :ivar elapsed: The number of seconds the runs took.
+    """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._results: List[TaskResult] = []
+        self.elapsed = 0.0
+
+    def __repr__(self) -> str:
+        return f"<TaskReport successes={len(self.successes)} failures={len(self.failures)} elapsed={self.elapsed:.3f}>"
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def add(self, result: TaskResult) -> None:
+        """
+        Adds a result to the report.
+
+        :param result: The result.
+        :type result: :class:`TaskResult`
+        """
+        with self._lock:
+            self._results.append(result)
+
+    @property
+    def results(self) -> List[TaskResult]:
+        """
+        Every result, in the order the items were submitted.
+        """
+        with self._lock:
+            return sorted(self._results, key=lambda result: result.index)
+
+    @property
+    def successes(self) -> List[TaskResult]:
+        """
+        The results of the tasks that succeeded, in the order the items were submitted.
+        """
+        return [result for result in self.results if result.succeeded]
+
+    @property
+    def failures(self) -> List[TaskResult]:
+        """
+        The results of the tasks that failed, in the order the items were submitted.
+        """
+        return [result for result in self.results if not result.succeeded]
+
+    @property
+    def durations(self) -> Dict[Any, float]:
+        """
+        A dictionary mapping each item to the number of seconds its task ran for.
+        """
+        return {result.item: result.duration for result in self.results}
+
+    def raise_for_failures(self) -> None:
+        """
+        Raises a :class:`RuntimeError` for the first failed item, if any.
+        """
+        failures = self.failures
+        if failures:
+            first = failures[0]
+            raise RuntimeError(f"{len(failures)} task(s) failed, first for {first.item!r}: {first.error}") from first.error
+
+
+class TaskExecutor:
+
+    """
+    A class that runs a function for many items with bounded concurrency.
+
+    At most ``max_workers`` tasks are queued or running at a time, so items are consumed lazily
+    and in order. Exceptions raised by tasks are recorded instead of being propagated.
+
+    :param max_workers: The maximum number of tasks to run at once.
+    :type max_workers: Optional[:class:`int`]
+    :param timeout: The number of seconds after which a task is reported as failed with a :class:`TimeoutError`, counted from when it started or, if it has not started, from when it was queued. A running task's thread is not interrupted, so its result is discarded and the remaining tasks are run on a fresh set of threads; functions that block, e.g. on the network, should also time out by themselves.
+    :type timeout: Optional[:class:`float`]
+    """
+
+    def __init__(self, max_workers: Optional[int] = 32, *, timeout: Optional[float] = None) -> None:
+        if max_workers is not None and max_workers < 1:
+            raise ValueError("'max_workers' must be at least 1.")
+        if timeout is not None and timeout <= 0:
+            raise ValueError("'timeout' must be positive.")
+
+        self.max_workers = max_workers or 32
+        self.timeout = timeout
+
+    def __repr__(self) -> str:
+        return f"<TaskExecutor max_workers={self.max_workers} timeout={self.timeout}>"
+
+    def stream(self, function: Callable[[Any], Any], items: Iterable[Any], *, report: Optional[TaskReport] = None) -> Generator[TaskResult, None, None]:
+        """
+        Runs a function for every item and yields the results as the tasks finish.
+
+        Closing the generator early cancels the tasks that have not started yet.
+
+        :param function: The function to run. It is called with one item at a time.
+        :type function: Callable
+        :param items: The items to run the function for.
+        :type items: Iterable
+        :param report: A report to add the results to.
+        :type report: Optional[:class:`TaskReport`]
+        """
+        started = monotonic()
+        tasks = _Tasks(function, self.max_workers, self.timeout)
+        iterator = enumerate(items)
+        try:
+            exhausted = False
+            while True:
+                while not exhausted and len(tasks.pending) < self.max_workers:
+                    try:
+                        index, item = next(iterator)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    tasks.submit(index, item)
+
+                if not tasks.pending:
+                    break
+
+                for result in tasks.wait():
+                    if report is not None:
+                        report.add(result)
+                    yield result
+        finally:
+            tasks.close()
+            if report is not None:
+                report.elapsed += monotonic() - started
+
+    def run(self, function: Callable[[Any], Any], items: Iterable[Any], *, report: Optional[TaskReport] = None) -> TaskReport:
+        """
+        Runs a function for every item and waits for every task to finish.
+
+        :param function: The function to run. It is called with one item at a time.
+        :type function: Callable
+        :param items: The items to run the function for.
+        :type items: Iterable
+        :param report: A report to add the results to. If not specified, a new one is created.
+        :type report: Optional[:class:`TaskReport`]
+        :return: The report of the run.
+        """
+        if report is None:
+            report = TaskReport()
+        for _ in self.stream(function, items, report=report):
+            pass
+        return report
+
+
+class _Tasks:
+
+    """
+    Tracks the tasks of one :meth:`TaskExecutor.stream` call, and replaces its threads when tasks hang.
+    """
+
+    def __init__(self, function: Callable[[Any], Any], max_workers: int, timeout: Optional[float]) -> None:
+        self.function = function
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.pending: Dict[Future, TaskResult] = {}
+        self._lock = Lock()
+        self._starts: Dict[int, float] = {}
+        self._submits: Dict[int, float] = {}
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._abandoned: List[ThreadPoolExecutor] = []
+
+    def _run(self, result: TaskResult) -> Any:
+        with self._lock:
+            self._starts[result.index] = monotonic()
+        return self.function(result.item)
+
+    def _finish(self, result: TaskResult, now: float) -> None:
+        with self._lock:
+            result.duration = now - self._starts.pop(result.index, now)
+        self._submits.pop(result.index, None)
+
+    def _deadline(self, result: TaskResult) -> float:
+        with self._lock:
+            return self._starts.get(result.index, self._submits[result.index]) + self.timeout
+
+    def submit(self, index: int, item: Any) -> None:
+        """
+        Queues the task for an item.
+        """
+        result = TaskResult(index, item)
+        self._submits[index] = monotonic()
+        self.pending[self._executor.submit(self._run, result)] = result
+
+    def wait(self) -> List[TaskResult]:
+        """
+        Waits until a task finishes or times out, and returns the results of every such task in order.
+        """
+        wait_timeout = None
+        if self.timeout is not None:
+            wait_timeout = max(0.0, min(self._deadline(result) for result in self.pending.values()) - monotonic())
+        done, _ = wait(self.pending, timeout=wait_timeout, return_when=FIRST_COMPLETED)
+
+        now = monotonic()
+        finished = []
+        for future in done:
+            result = self.pending.pop(future)
+            self._finish(result, now)
+            try:
+                result.value = future.result()
+            # Exceptions raised by tasks are recorded in their results instead of being propagated.
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                result.error = e
+            finished.append(result)
+
+        if self.timeout is not None:
+            finished.extend(self._expire(now))
+        return sorted(finished, key=lambda result: result.index)
+
+    def _expire(self, now: float) -> List[TaskResult]:
+        expired = []
+        hung = False
+        for future, result in list(self.pending.items()):
+            if future.done() or self._deadline(result) > now:
+                continue
+            del self.pending[future]
+            hung = not future.cancel() or hung
+            self._finish(result, now)
+            result.error = TimeoutError(f"Task for {result.item!r} timed out after {self.timeout} seconds.")
+            expired.append(result)
+        if hung:
+            self._abandoned.append(self._executor)
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        return expired
+
+    def close(self) -> None:
+        """
+        Cancels the tasks that have not started yet and lets go of the threads.
+        """
+        for future in self.pending:
+            future.cancel()
+        for pool in self._abandoned + [self._executor]:
+            pool.shutdown(wait=False)
+
+
+def _record(values: Iterable[Any], report: Optional[TaskReport], key: Callable[[Any], Any]) -> Generator[Any, None, None]:
+    """
+    Yields values that were computed elsewhere, e.g. by a daemon, and records each in a report as a task that succeeded for ``key(value)``.
+    """
+    for index, value in enumerate(values):
+        if report is not None:
+            report.add(TaskResult(index, key(value), value))
+        yield value
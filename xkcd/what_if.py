@@ -26,13 +26,16 @@ SOFTWARE.
 from os.path import split
 from random import randint
 from urllib.parse import urlparse
+from urllib.error import HTTPError
 from urllib.request import urlopen, Request
 from typing import Optional, Generator, List
-from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from bs4 import BeautifulSoup
 from bs4.element import Tag
 
+from .client import daemon_request
+from .tasks import TaskExecutor, TaskReport, _record
+
 
 WHAT_IF_BASE_URL = "https://what-if.xkcd.com/"
 
@@ -123,12 +126,7 @@ class WhatIfArticle:
         if random and number:
             raise ValueError("If 'random' is 'True', 'number' must not be specified.")
 
-        page = Request(f"{WHAT_IF_BASE_URL}archive")
-        with urlopen(page) as result:
-            soup = BeautifulSoup(result.read(), "html.parser")
-
-        entries = soup.find_all("div", {"class": "archive-entry"})
-        latest = int(entries[-1].a.attrs["href"].split("/")[-1])
+        latest = _fetch_latest_article_number()
         if random:
             self.number = randint(1, latest)
         else:
@@ -139,10 +137,24 @@ class WhatIfArticle:
                     raise ValueError("You have chosen an article after the latest one.")
                 self.number = number
 
-        page = Request(f"{WHAT_IF_BASE_URL}{self.number}")
-        with urlopen(page) as result:
-            soup = BeautifulSoup(result.read(), "html.parser")
+        self._load(BeautifulSoup(_fetch_article_page(self.number), "html.parser"))
+
+    @classmethod
+    def from_page(cls, number: int, page: str) -> "WhatIfArticle":
+        """
+        Creates an article from its HTML page without fetching it.
+
+        :param number: The article's number.
+        :type number: :class:`int`
+        :param page: The article's HTML page.
+        :type page: :class:`str`
+        """
+        article = cls.__new__(cls)
+        article.number = number
+        article._load(BeautifulSoup(page, "html.parser"))
+        return article
 
+    def _load(self, soup: BeautifulSoup) -> None:
         self.entry = []
         for item in soup.find("article", {"id": "entry"}).children:
             if isinstance(item, Tag) and "id" not in item.attrs:
@@ -208,6 +220,54 @@ class WhatIfArticle:
             return NotImplemented
         return self.number == other.number
 
+def _download_latest_article_number(*, timeout: Optional[float] = 30) -> int:
+    page = Request(f"{WHAT_IF_BASE_URL}archive")
+    with urlopen(page, timeout=timeout) as result:
+        soup = BeautifulSoup(result.read(), "html.parser")
+
+    entries = soup.find_all("div", {"class": "archive-entry"})
+    return int(entries[-1].a.attrs["href"].split("/")[-1])
+
+def _download_article_page(number: int, *, timeout: Optional[float] = 30) -> Optional[str]:
+    page = Request(f"{WHAT_IF_BASE_URL}{number}")
+    try:
+        with urlopen(page, timeout=timeout) as result:
+            return result.read().decode("utf-8", errors="replace")
+    except HTTPError as e:
+        if e.code == 404:
+            return None
+        raise
+
+def _fetch_latest_article_number() -> int:
+    response = daemon_request("articles/latest")
+    if response is None:
+        return _download_latest_article_number()
+    return int(response["number"])
+
+def _fetch_article_page(number: int, *, timeout: Optional[float] = 30) -> str:
+    response = daemon_request(f"articles/{number}")
+    if response is not None:
+        return response["page"]
+    page = _download_article_page(number, timeout=timeout)
+    if page is None:
+        raise ValueError(f"Article {number} does not exist.")
+    return page
+
+def _article_text(article: WhatIfArticle) -> str:
+    data = "".join([str(article.number), article.title, article.question, article.author if article.author else "", article.url]).lower()
+
+    for item in article.entry:
+        if isinstance(item, WhatIfArticle.Image):
+            data += item.alt.lower() + item.url.lower()
+        elif isinstance(item, WhatIfArticle.Hyperlink):
+            data += item.text.lower() + item.url.lower()
+        elif isinstance(item, WhatIfArticle.Reference):
+            data += str(item).lower() + str(item.number).lower()
+        else:
+            data += item.lower()
+
+    return data
+
 def stream_articles(start: Optional[int] = 1, end: Optional[int] = None) -> Generator[WhatIfArticle, None, None]:
     """
     A generator that yields What If articles.
@@ -218,7 +278,7 @@ def stream_articles(start: Optional[int] = 1, end: Optional[int] = None) -> Gene
     :type end: Optional[:class:`int`]
     """
     if end is None:
-        end = WhatIfArticle().number
+        end = _fetch_latest_article_number()
 
     if start < 1 or end < start:
         raise ValueError("Invalid range for articles.")
@@ -226,47 +286,41 @@ def stream_articles(start: Optional[int] = 1, end: Optional[int] = None) -> Gene
     for number in range(start, end + 1):
         yield WhatIfArticle(number)
 
-def search_articles(query: str, *, max_workers: Optional[int] = 32) -> Generator[WhatIfArticle, None, None]:
+def search_articles(query: str, *, max_workers: Optional[int] = 32, timeout: Optional[float] = None, report: Optional[TaskReport] = None) -> Generator[WhatIfArticle, None, None]:
     """
     Searches for articles by title or question.
 
     .. note::
 
         The articles returned may not be in chronological order due to multithreading.
+        If a local query daemon is running, the results are taken from its in-memory index.
 
     :param query: The search query.
     :type query: :class:`str`
     :param max_workers: The maximum number of threads to use for searching.
     :type max_workers: Optional[:class:`int`]
+    :param timeout: The number of seconds after which fetching an article is given up on. It is also used as the HTTP timeout, which is 30 seconds by default.
+    :type timeout: Optional[:class:`float`]
+    :param report: A report to record the articles that were fetched or failed to be fetched in. If a local daemon answers, only the matching articles are recorded.
+    :type report: Optional[:class:`TaskReport`]
     """
     if not query:
         raise ValueError("Query must not be empty.")
 
     def try_article(number: int):
-        try:
-            article = WhatIfArticle(number)
-            data = "".join([str(article.number), article.title, article.question, article.author if article.author else "", article.url]).lower()
-
-            for item in article.entry:
-                if isinstance(item, WhatIfArticle.Image):
-                    data += item.alt.lower() + item.url.lower()
-                elif isinstance(item, WhatIfArticle.Hyperlink):
-                    data += item.text.lower() + item.url.lower()
-                elif isinstance(item, WhatIfArticle.Reference):
-                    data += str(item).lower() + str(item.number).lower()
-                else:
-                    data += item.lower()
-
-            if query.lower() in data:
-                return article
-        except RuntimeError:
-            pass
+        article = WhatIfArticle.from_page(number, _fetch_article_page(number, timeout=timeout or 30))
+        if query.lower() in _article_text(article):
+            return article
         return None
 
-    latest = WhatIfArticle().number
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = [executor.submit(try_article, n) for n in range(1, latest + 1)]
-        for future in as_completed(futures):
-            result = future.result()
-            if result:
-                yield result
+    results = daemon_request("articles/search", q=query)
+    if results is not None:
+        articles = (WhatIfArticle.from_page(result["number"], result["page"]) for result in results)
+        yield from _record(articles, report, lambda article: article.number)
+        return
+
+    latest = _fetch_latest_article_number()
+    executor = TaskExecutor(max_workers, timeout=timeout)
+    for result in executor.stream(try_article, range(1, latest + 1), report=report):
+        if result.value:
+            yield result.value
@@ -0,0 +1,248 @@
+"""
+MIT License
+
+Copyright (c) 2025 Omkaar
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+from re import compile as compile_pattern, DOTALL
+from threading import Lock
+from typing import Optional, Dict, Iterable, List
+
+from requests import get
+
+from .tasks import TaskExecutor
+
+
+XKCD_WIKI_API_URL = "https://www.explainxkcd.com/wiki/api.php"
+
+_SECTION_PATTERN = compile_pattern(r"^==\s*([^=].*?)\s*==\s*$")
+_REF_PATTERN = compile_pattern(r"<ref[^>/]*>.*?</ref>|<ref[^>]*/>", DOTALL)
+_TAG_PATTERN = compile_pattern(r"<[^>]+>")
+_TEMPLATE_PATTERN = compile_pattern(r"\{\{[^{}]*\}\}")
+_LINK_PATTERN = compile_pattern(r"\[\[(?:[^\]|]*\|)?([^\]]*)\]\]")
+_EXTERNAL_LINK_PATTERN = compile_pattern(r"\[(?:https?:)?//\S+\s+([^\]]*)\]")
+
+
+class Explanation:
+
+    """
+    A class that represents a comic's explanation on explainxkcd.
+
+    :ivar number: The number of the comic that is explained.
+    :ivar title: The title of the wiki page.
+    :ivar wikitext: The raw wikitext of the page.
+    :ivar text: The plain text of the page's "Explanation" section.
+    :ivar incomplete: Whether the wiki marks the explanation as incomplete, or not.
+    :ivar url: The URL of the wiki page.
+    """
+
+    def __init__(self, number: int, title: str, wikitext: str, *, base_url: str = XKCD_WIKI_API_URL) -> None:
+        self.number = number
+        self.title = title
+        self.wikitext = wikitext
+        self.incomplete = "{{incomplete" in wikitext.lower()
+        self.text = _to_plain_text(_get_section(wikitext, "Explanation"))
+        self.url = f"{base_url.rsplit('/', 1)[0]}/index.php/{title.replace(' ', '_')}"
+
+    def __repr__(self) -> str:
+        return f"<Explanation number={self.number} title={self.title!r}>"
+
+    def __str__(self) -> str:
+        return self.text
+
+    def __int__(self) -> int:
+        return self.number
+
+
+class Wiki:
+
+    """
+    A class that fetches comic explanations from explainxkcd in batches.
+
+    Explanations are requested through MediaWiki's ``action=query`` API with many
+    titles per request, parsed in a thread pool and cached for the lifetime of the object.
+
+    :param api_url: The URL of the wiki's ``api.php`` endpoint.
+    :type api_url: Optional[:class:`str`]
+    :param batch_size: The number of pages to request at once. MediaWiki allows at most 50.
+    :type batch_size: Optional[:class:`int`]
+    :param max_workers: The maximum number of threads to use for fetching and parsing pages.
+    :type max_workers: Optional[:class:`int`]
+    """
+
+    def __init__(self, api_url: Optional[str] = XKCD_WIKI_API_URL, *, batch_size: Optional[int] = 50, max_workers: Optional[int] = 8) -> None:
+        if not 1 <= batch_size <= 50:
+            raise ValueError("'batch_size' must be between 1 and 50.")
+
+        self.api_url = api_url
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self._cache: Dict[int, Optional[Explanation]] = {}
+        self._lock = Lock()
+
+    def __repr__(self) -> str:
+        return f"<Wiki api_url={self.api_url!r} cached={len(self._cache)}>"
+
+    def _query(self, titles: List[str]) -> Dict[str, str]:
+        params = {
+            "action": "query",
+            "format": "json",
+            "formatversion": "2",
+            "prop": "revisions",
+            "rvprop": "content",
+            "rvslots": "main",
+            "redirects": "1",
+            "titles": "|".join(titles)
+        }
+        pages = {}
+        while True:
+            try:
+                response = get(self.api_url, params=params, timeout=30)
+                response.raise_for_status()
+                data = response.json()
+            except Exception as e:
+                raise RuntimeError(f"Failed to fetch wiki pages: {e}") from e
+
+            for page in data.get("query", {}).get("pages", []):
+                revisions = page.get("revisions")
+                if page.get("missing") or not revisions:
+                    continue
+                revision = revisions[0]
+                content = revision.get("slots", {}).get("main", revision).get("content")
+                if content is not None:
+                    pages[page["title"]] = content
+
+            if "continue" not in data:
+                return pages
+            params.update(data["continue"])
+
+    def _parse(self, title: str, wikitext: str) -> Optional[Explanation]:
+        number = _get_number(title)
+        if number is None:
+            return None
+        return Explanation(number, title, wikitext, base_url=self.api_url)
+
+    def get_explanations(self, numbers: Iterable[int]) -> Dict[int, Optional[Explanation]]:
+        """
+        Gets the explanations of several comics.
+
+        Comics whose explanations are cached are not requested again. If some requests fail, the
+        explanations from the other requests are cached before a :class:`RuntimeError` is raised.
+
+        :param numbers: The numbers of the comics.
+        :type numbers: Iterable[:class:`int`]
+        :return: A dictionary mapping each comic number to its explanation, or ``None`` if it has no wiki page.
+        """
+        numbers = list(dict.fromkeys(int(number) for number in numbers))
+        with self._lock:
+            missing = [number for number in numbers if number not in self._cache]
+
+        if missing:
+            batches = [missing[i:i + self.batch_size] for i in range(0, len(missing), self.batch_size)]
+            executor = TaskExecutor(self.max_workers)
+            queries = executor.run(lambda batch: self._query([str(number) for number in batch]), batches)
+            pages = {}
+            for result in queries.successes:
+                pages.update(result.value)
+
+            parses = executor.run(lambda page: self._parse(*page), pages.items())
+            found = {result.value.number: result.value for result in parses.successes if result.value}
+            unparsed = {_get_number(result.item[0]) for result in parses.failures}
+
+            with self._lock:
+                for result in queries.successes:
+                    for number in result.item:
+                        if number not in unparsed:
+                            self._cache[number] = found.get(number)
+
+            queries.raise_for_failures()
+            parses.raise_for_failures()
+
+        with self._lock:
+            return {number: self._cache[number] for number in numbers}
+
+    def get_explanation(self, number: int) -> Optional[Explanation]:
+        """
+        Gets the explanation of a comic.
+
+        :param number: The number of the comic.
+        :type number: :class:`int`
+        :return: The explanation, or ``None`` if the comic has no wiki page.
+        """
+        return self.get_explanations([number])[number]
+
+    def clear_cache(self) -> None:
+        """
+        Clears the cached explanations.
+        """
+        with self._lock:
+            self._cache.clear()
+
+_default_wiki = Wiki()
+
+def get_explanations(numbers: Iterable[int]) -> Dict[int, Optional[Explanation]]:
+    """
+    Gets the explanations of several comics from explainxkcd, using a shared cache.
+
+    :param numbers: The numbers of the comics.
+    :type numbers: Iterable[:class:`int`]
+    """
+    return _default_wiki.get_explanations(numbers)
+
+def get_explanation(number: int) -> Optional[Explanation]:
+    """
+    Gets the explanation of a comic from explainxkcd, using a shared cache.
+
+    :param number: The number of the comic.
+    :type number: :class:`int`
+    """
+    return _default_wiki.get_explanation(number)
+
+def _get_number(title: str) -> Optional[int]:
+    number = title.split(":", 1)[0].strip()
+    return int(number) if number.isdigit() else None
+
+def _get_section(wikitext: str, name: str) -> str:
+    lines = []
+    inside = False
+    for line in wikitext.splitlines():
+        match = _SECTION_PATTERN.match(line)
+        if match:
+            if inside:
+                break
+            inside = match.group(1).lower() == name.lower()
+        elif inside:
+            lines.append(line)
+    return "\n".join(lines)
+
+def _to_plain_text(wikitext: str) -> str:
+    text = _REF_PATTERN.sub("", wikitext)
+    previous = None
+    while previous != text:
+        previous = text
+        text = _TEMPLATE_PATTERN.sub("", text)
+    text = _LINK_PATTERN.sub(r"\1", text)
+    text = _EXTERNAL_LINK_PATTERN.sub(r"\1", text)
+    text = _TAG_PATTERN.sub("", text)
+    text = text.replace("'''", "").replace("''", "")
+    paragraphs = [" ".join(paragraph.split()) for paragraph in text.split("\n\n")]
+    return "\n\n".join(paragraph for paragraph in paragraphs if paragraph)